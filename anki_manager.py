@@ -1,12 +1,26 @@
 import os
-import json
 import genanki
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Set, Tuple, Any, Optional
-from deck_storage import save_deck_to_storage, get_words_from_all_stored_decks, is_valid_json_file, extract_words_from_apkg
+from deck_storage import (
+    DECK_STORAGE_DIR, save_deck_to_storage, get_known_words, read_deck_words,
+    extract_words_from_apkg, write_json_atomic
+)
+from deck_index import index_lock
+from sonnet_translator import translate_batch
 from utils import get_existing_words
 
+# Number of decks loaded in parallel by compare_with_existing_decks
+DECK_LOAD_WORKERS = max(1, int(os.environ.get("DECK_LOAD_WORKERS", "4")))
+
+# Seconds a single deck may take to load before the comparison goes on without it
+DECK_LOAD_TIMEOUT = float(os.environ.get("DECK_LOAD_TIMEOUT", "30"))
+
+# Seconds between checks for decks that exceeded their timeout
+DECK_LOAD_POLL_INTERVAL = 0.1
+
 def get_existing_words_from_deck(deck_path: str) -> Dict[str, List[str]]:
     """
     Extract words from an existing Anki deck.
@@ -17,8 +31,6 @@ def get_existing_words_from_deck(deck_path: str) -> Dict[str, List[str]]:
     Returns:
         Dictionary of categorized words from the deck
     """
-    from deck_storage import is_valid_json_file, extract_words_from_apkg
-    
     print(f"DEBUG: get_existing_words_from_deck called with path: {deck_path}")
     
     # For files without extension (which are already JSON)
@@ -30,49 +42,35 @@ def get_existing_words_from_deck(deck_path: str) -> Dict[str, List[str]]:
         json_path = deck_path.replace('.apkg', '.json')
         print(f"DEBUG: Extension found, converted to JSON path: {json_path}")
     
-    # Check if the JSON file exists and is a valid JSON file
-    file_exists = os.path.exists(json_path)
-    is_valid = is_valid_json_file(json_path) if file_exists else False
-    print(f"DEBUG: JSON file exists: {file_exists}, is valid JSON: {is_valid}")
-    
-    # First try to load from the JSON companion file
-    if file_exists and is_valid:
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                words_dict = json.load(f)
-                print(f"DEBUG: Successfully loaded words from JSON file: {len(words_dict)} categories")
-                return words_dict
-        except UnicodeDecodeError:
-            # Try with different encodings if utf-8 fails
-            try:
-                with open(json_path, 'r', encoding='latin-1') as f:
-                    words_dict = json.load(f)
-                    print(f"DEBUG: Successfully loaded words from JSON file with latin-1 encoding: {len(words_dict)} categories")
-                    return words_dict
-            except Exception as e:
-                print(f"Error reading words from {json_path} with latin-1 encoding: {str(e)}")
-                # Continue to try direct extraction
-        except Exception as e:
-            print(f"Error reading words from {json_path}: {str(e)}")
-            # Continue to try direct extraction
+    # First try to load from the JSON companion file (validated and parsed in one pass)
+    words_dict = read_deck_words(json_path)
+    if words_dict is not None:
+        print(f"DEBUG: Successfully loaded words from JSON file: {len(words_dict)} categories")
+        return words_dict
+    print(f"DEBUG: No valid JSON word list at {json_path}")
     
-    # If JSON file doesn't exist or is invalid, try direct extraction from .apkg
+    # If JSON file doesn't exist or is invalid, try direct extraction from .apkg.
+    # Extraction runs outside the storage lock so parallel loads and saves aren't serialized.
     if deck_path.endswith('.apkg') and os.path.exists(deck_path):
         try:
             print(f"DEBUG: Attempting direct extraction from .apkg file: {deck_path}")
             words_dict = extract_words_from_apkg(deck_path)
-            
-            # Save the extracted words to a JSON file for future use
+        except Exception as e:
+            print(f"Error extracting words directly from {deck_path}: {str(e)}")
+            words_dict = None
+        
+        if words_dict is not None:
+            # Save the extracted words to a JSON file for future use, unless another
+            # worker rebuilt the word list in the meantime
             try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(words_dict, f, ensure_ascii=False, indent=2)
-                print(f"DEBUG: Saved extracted words to JSON file: {json_path}")
+                with index_lock(DECK_STORAGE_DIR):
+                    if read_deck_words(json_path) is None:
+                        write_json_atomic(json_path, words_dict)
+                        print(f"DEBUG: Saved extracted words to JSON file: {json_path}")
             except Exception as e:
                 print(f"Warning: Could not save extracted words to JSON: {str(e)}")
             
             return words_dict
-        except Exception as e:
-            print(f"Error extracting words directly from {deck_path}: {str(e)}")
     
     # If all extraction methods fail, return empty dictionary with the expected structure
     print(f"DEBUG: All extraction methods failed, returning empty dictionary")
@@ -84,9 +82,80 @@ def get_existing_words_from_deck(deck_path: str) -> Dict[str, List[str]]:
         "other": []
     }
 
+def load_existing_decks(
+    deck_paths: List[str],
+    timeout: float = DECK_LOAD_TIMEOUT,
+    workers: int = DECK_LOAD_WORKERS
+) -> Tuple[Dict[str, Dict[str, List[str]]], Dict[str, Dict[str, Any]]]:
+    """
+    Load several decks in parallel.
+    
+    Each deck gets its own timeout, counted from when its load starts; decks that
+    exceed it or fail are left out so one slow or corrupt deck can't stall the rest.
+    
+    Args:
+        deck_paths: Paths to the Anki decks (.apkg files) or JSON files
+        timeout: Seconds a single deck may take to load
+        workers: Number of decks loaded at the same time
+        
+    Returns:
+        Tuple of (dictionary mapping each loaded path to its categorized words,
+        dictionary mapping each path to {"status": "loaded"/"timeout"/"error", "seconds": float})
+    """
+    deck_words = {}
+    report = {}
+    if not deck_paths:
+        return deck_words, report
+    
+    start_times = {}
+    
+    def load(deck_path: str) -> Dict[str, List[str]]:
+        start_times[deck_path] = time.perf_counter()
+        # Word lists are memoized by read_deck_words while the JSON file is unchanged
+        return get_existing_words_from_deck(deck_path)
+    
+    workers = min(workers, len(deck_paths))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(load, deck_path): deck_path for deck_path in dict.fromkeys(deck_paths)}
+        pending = set(futures)
+        # Decks still queued behind hung loads give up once every round of workers could have timed out
+        deadline = time.perf_counter() + timeout * -(-len(futures) // workers)
+        while pending:
+            done, pending = wait(pending, timeout=DECK_LOAD_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            
+            for future in done:
+                deck_path = futures[future]
+                seconds = now - start_times.get(deck_path, now)
+                try:
+                    deck_words[deck_path] = future.result()
+                    report[deck_path] = {"status": "loaded", "seconds": seconds}
+                except Exception as e:
+                    print(f"Error processing deck {deck_path}: {str(e)}")
+                    report[deck_path] = {"status": "error", "seconds": seconds}
+            
+            for future in list(pending):
+                deck_path = futures[future]
+                started = start_times.get(deck_path)
+                if (started is not None and now - started > timeout) or now > deadline:
+                    print(f"Warning: Loading deck {deck_path} timed out after {timeout:.0f}s, skipping it")
+                    report[deck_path] = {"status": "timeout", "seconds": now - (started or now)}
+                    pending.discard(future)
+    finally:
+        # Don't wait for timed-out loads; they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    for deck_path, info in report.items():
+        print(f"DEBUG: Deck {deck_path} {info['status']} in {info['seconds']:.2f}s")
+    
+    return deck_words, report
+
 def compare_with_existing_decks(
     new_words: Dict[str, List[str]], 
-    existing_decks: List[str]
+    existing_decks: List[str],
+    language: str = "Spanish",
+    load_report: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
     """
     Compare extracted words with existing decks to identify new words.
@@ -94,6 +163,8 @@ def compare_with_existing_decks(
     Args:
         new_words: Dictionary of categorized words extracted from the PDF
         existing_decks: List of paths to existing Anki decks (can include format "name (path)")
+        language: Language of the stored decks to compare against
+        load_report: Optional dictionary filled with each deck's load status and seconds
         
     Returns:
         Tuple of (new_words_dict, existing_words_dict)
@@ -102,34 +173,30 @@ def compare_with_existing_decks(
     new_words_dict = {category: [] for category in new_words}
     existing_words_dict = {category: [] for category in new_words}
     
-    # First get words from stored decks
-    all_existing_words = get_words_from_all_stored_decks()
+    # Words from stored decks: a shared, prebuilt set of lowercase words
+    known_words = get_known_words(language)
     
-    # Then add words from specified existing decks
+    # Normalize the "name (path)" format to the actual path
+    deck_paths = []
     for deck_path in existing_decks:
-        # Handle the case where the deck path is in the format "name (path)"
         if " (" in deck_path and deck_path.endswith(")"):
-            # Extract the actual path from the format "name (path)"
             deck_path = deck_path.split(" (", 1)[1].rstrip(")")
-        
-        try:
-            deck_words = get_existing_words_from_deck(deck_path)
-            for category, words in deck_words.items():
-                # Process words considering both simple words and normalized adjective format (word/wordFeminine)
-                for word in words:
-                    if '/' in word:
-                        # Split and add both forms
-                        parts = word.split('/')
-                        all_existing_words.update(parts)
-                    else:
-                        all_existing_words.add(word)
-        except Exception as e:
-            print(f"Error processing deck {deck_path}: {str(e)}")
-            # Continue with other decks even if one fails
-            continue
+        deck_paths.append(deck_path)
+    
+    # Lowercase words from the specified existing decks, loaded in parallel
+    loaded_decks, report = load_existing_decks(deck_paths)
+    if load_report is not None:
+        load_report.update(report)
+    
+    selected_words = set()
+    for deck_words in loaded_decks.values():
+        for words in deck_words.values():
+            # Process words considering both simple words and normalized adjective format (word/wordFeminine)
+            for word in words:
+                selected_words.update(part.lower() for part in word.split('/'))
     
-    # Convert all existing words to lowercase for case-insensitive comparison
-    all_existing_words_lower = {word.lower() for word in all_existing_words}
+    def is_known(word_lower: str) -> bool:
+        return word_lower in known_words or word_lower in selected_words
     
     # Keep track of words we've seen in this processing session to avoid duplicates across categories
     already_processed = set()
@@ -142,11 +209,11 @@ def compare_with_existing_decks(
                 # Check both parts of combined adjectives
                 word_parts = word.split('/')
                 # If any part exists in existing words, consider the whole word as existing
-                is_existing = any(part.lower() in all_existing_words_lower for part in word_parts)
+                is_existing = any(is_known(part.lower()) for part in word_parts)
             else:
                 word_lower = word.lower()
                 # Check if word already exists in any deck
-                is_existing = word_lower in all_existing_words_lower
+                is_existing = is_known(word_lower)
                 
                 # Skip duplicates across categories, but still keep track of all words
                 if word_lower in already_processed:
@@ -214,7 +281,8 @@ def create_anki_deck(
     language: str,
     store_deck: bool = True,
     existing_deck_path: Optional[str] = None,
-    merge_existing: bool = False
+    merge_existing: bool = False,
+    stage_times: Optional[Dict[str, float]] = None
 ) -> str:
     """
     Create an Anki deck from the words.
@@ -227,10 +295,15 @@ def create_anki_deck(
         store_deck: Whether to save this deck to permanent storage
         existing_deck_path: Path to an existing deck to merge with
         merge_existing: Whether to merge with an existing deck
+        stage_times: Optional dictionary filled with the seconds spent in each build stage
         
     Returns:
         Path to the created Anki deck file
     """
+    if stage_times is None:
+        stage_times = {}
+    stage_start = time.perf_counter()
+    
     # Create a unique deck ID
     deck_id = random.randrange(1 << 30, 1 << 31)
     
@@ -269,13 +342,21 @@ def create_anki_deck(
         # Just use the provided words
         merged_words_dict = words_dict
     
+    stage_times["merge"] = time.perf_counter() - stage_start
+    
+    # Translate all unique words up front: known words come from the translation
+    # memory, the rest go out in concurrent batch requests
+    stage_start = time.perf_counter()
+    all_words = [word for words in merged_words_dict.values() for word in words]
+    translations = translate_batch(all_words, source_lang="es", target_lang="en")
+    stage_times["translate"] = time.perf_counter() - stage_start
+    
     # Process each category and add cards
+    stage_start = time.perf_counter()
     for category, words in merged_words_dict.items():
         for word in words:
             # Create note fields
-            # Get translation
-            from sonnet_translator import translate_text
-            translation = translate_text(word, source_lang="es", target_lang="en") or f"[{language} translation]"
+            translation = translations.get(word) or f"[{language} translation]"
             
             fields = [
                 word,                               # Word
@@ -295,7 +376,10 @@ def create_anki_deck(
             note = genanki.Note(model=model, fields=fields)
             deck.add_note(note)
     
+    stage_times["notes"] = time.perf_counter() - stage_start
+    
     # Create a package from the deck
+    stage_start = time.perf_counter()
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     output_path = f"{deck_name}_{timestamp}.apkg"
     
@@ -305,12 +389,16 @@ def create_anki_deck(
     
     # Create a companion JSON file with the words (for future reference)
     json_path = output_path.replace('.apkg', '.json')
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(merged_words_dict, f, ensure_ascii=False, indent=2)
+    write_json_atomic(json_path, merged_words_dict)
+    stage_times["package"] = time.perf_counter() - stage_start
     
     # Store the deck in permanent storage if requested
     if store_deck:
+        stage_start = time.perf_counter()
         stored_path = save_deck_to_storage(output_path, deck_name)
+        stage_times["store"] = time.perf_counter() - stage_start
         print(f"Deck saved to permanent storage: {stored_path}")
     
+    print(f"DEBUG: Deck build stages for {len(all_words)} words: " +
+          ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stage_times.items()))
     return output_path
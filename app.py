@@ -2,16 +2,18 @@ import streamlit as st
 import os
 import tempfile
 import time
+import hashlib
 import PyPDF2
 from typing import Optional, Tuple, Dict, List
-from pdf_processor import extract_text_from_pdf, find_word_sentences
-from nlp_processor import categorize_words
+from pdf_processor import iter_pdf_pages, find_word_sentences, get_pdf_cache_stats
+from nlp_processor import categorize_words, analyze_pages, get_cached_categories, warmup_language_models, get_model_cache_stats, get_categorize_cache_stats
 from anki_manager import compare_with_existing_decks, create_anki_deck
 from audio_generator import generate_audio_for_words
 from utils import get_existing_decks, save_temp_file, get_existing_words
 from csv_exporter import export_words_to_csv, export_category_to_csv
 from local_script_integration import save_csv_for_local_processing, prepare_anki_script_config, prepare_audio_script_config, save_script_configuration
-from deck_storage import get_stored_decks, delete_stored_deck
+from deck_storage import get_stored_decks, delete_stored_deck, get_known_words_stats, start_deck_watcher
+from rate_limiter import get_rate_limiter_stats
 
 # Set page config
 st.set_page_config(
@@ -55,6 +57,12 @@ st.sidebar.header("Configuration")
 language = "Spanish"
 st.sidebar.info("This platform is dedicated to Spanish language learning only.")
 
+# Load the spaCy model into the process-wide cache once, so later reruns and sessions reuse it
+warmup_language_models([language], profile="categorize")
+
+# Pick up decks added or changed outside the app (one watcher per server process)
+start_deck_watcher()
+
 # Anki deck upload
 st.sidebar.subheader("Upload Existing Anki Deck")
 uploaded_deck = st.sidebar.file_uploader(
@@ -133,7 +141,7 @@ if selected_decks:
                 deck_name = deck_option.split(" (", 1)[0]
                 
                 # Get the words from this deck
-                from deck_storage import is_valid_json_file
+                from deck_storage import read_deck_words
                 
                 # For files without extension (which are already JSON)
                 if '.' not in deck_path:
@@ -143,25 +151,21 @@ if selected_decks:
                 
                 # Try to get words from JSON file first
                 words_found = False
-                if os.path.exists(json_path) and is_valid_json_file(json_path):
-                    try:
-                        with open(json_path, 'r', encoding='utf-8') as f:
-                            deck_words = json.load(f)
-                            st.write(f"**{deck_name}**")
+                deck_words = read_deck_words(json_path)
+                if deck_words is not None:
+                    st.write(f"**{deck_name}**")
+                    
+                    # Show words by category with a limit
+                    for category, words in deck_words.items():
+                        if words:
+                            words_found = True
+                            all_words_found = True
+                            # Limit to 10 words per category to avoid cluttering the sidebar
+                            display_words = words[:10]
+                            if len(words) > 10:
+                                display_words.append(f"... and {len(words) - 10} more")
                             
-                            # Show words by category with a limit
-                            for category, words in deck_words.items():
-                                if words:
-                                    words_found = True
-                                    all_words_found = True
-                                    # Limit to 10 words per category to avoid cluttering the sidebar
-                                    display_words = words[:10]
-                                    if len(words) > 10:
-                                        display_words.append(f"... and {len(words) - 10} more")
-                                    
-                                    st.write(f"*{category}*: {', '.join(display_words)}")
-                    except Exception as e:
-                        st.write(f"Error reading words from {deck_name}: {str(e)}")
+                            st.write(f"*{category}*: {', '.join(display_words)}")
                 
                 # If no words found in JSON, try direct extraction from .apkg
                 if not words_found and deck_path.endswith('.apkg') and os.path.exists(deck_path):
@@ -185,8 +189,8 @@ if selected_decks:
                         
                         # Save the extracted words to a JSON file for future use
                         try:
-                            with open(json_path, 'w', encoding='utf-8') as f:
-                                json.dump(deck_words, f, ensure_ascii=False, indent=2)
+                            from deck_storage import write_json_atomic
+                            write_json_atomic(json_path, deck_words)
                         except Exception as e:
                             print(f"Warning: Could not save extracted words to JSON: {str(e)}")
                     except Exception as e:
@@ -258,6 +262,22 @@ with st.sidebar.expander("Advanced Options"):
     
     # Note about audio quality
     st.caption("If Google Cloud credentials are not provided, the platform will use the default gTTS service.")
+    
+    # Show how the shared NLP model cache is being used by this server process
+    model_cache_stats = get_model_cache_stats()
+    st.caption(f"NLP model cache: {model_cache_stats['loads']} loads, {model_cache_stats['hits']} hits, "
+               f"{len(model_cache_stats['resident'])} resident")
+    pdf_cache_stats = get_pdf_cache_stats()
+    st.caption(f"PDF text cache: {pdf_cache_stats['hits']} hits, {pdf_cache_stats['misses']} misses")
+    categorize_cache_stats = get_categorize_cache_stats()
+    st.caption(f"Word categorization cache: {categorize_cache_stats['memory_hits'] + categorize_cache_stats['disk_hits']} hits, "
+               f"{categorize_cache_stats['misses']} misses")
+    known_words_stats = get_known_words_stats()
+    st.caption(f"Known-word sets: {known_words_stats['words']:,} words, "
+               f"{known_words_stats['bytes'] / (1024 * 1024):.1f} MB, {known_words_stats['builds']} builds")
+    for provider, limiter_stats in get_rate_limiter_stats().items():
+        st.caption(f"{provider} rate limit: {limiter_stats['rate']:.1f} requests/s, {limiter_stats['calls']} calls, "
+                   f"{limiter_stats['throttled']} throttled, {limiter_stats['wait_seconds']:.1f}s waited")
 
 # File uploader with explicit type and additional help text
 uploaded_file = st.file_uploader(
@@ -340,9 +360,20 @@ if uploaded_file is not None:
                     end_page = len(reader.pages)
                 page_range = (start_page, end_page)
                 
-            # Step 1: Extract text from PDF with page range
+            # Step 1: Extract text from PDF with page range, reporting progress page by page
             status_text.text(f"Extracting text from pages {start_page} to {end_page}...")
-            pdf_text = extract_text_from_pdf(temp_file_path, page_range)
+            # Digest the text as pages arrive (pages joined with a single space, as
+            # analyze_pages does) so a categorized book is recognized without reparsing
+            page_texts = []
+            text_digest = hashlib.sha256()
+            for page_number, page_text in iter_pdf_pages(temp_file_path, page_range):
+                status_text.text(f"Extracting page {page_number} of {end_page}...")
+                progress_bar.progress(int(20 * (page_number - start_page + 1) / (end_page - start_page + 1)))
+                if page_text:
+                    text_digest.update(((" " if page_texts else "") + page_text).encode("utf-8"))
+                    page_texts.append(page_text)
+            text_digest = text_digest.hexdigest()
+            pdf_text = " ".join(page_texts)
             st.session_state.pdf_text = pdf_text
             
             # Store the PDF name (either from uploaded file or sample)
@@ -365,13 +396,25 @@ if uploaded_file is not None:
             # Get existing words to prevent duplicates
             existing_words_set = get_existing_words()
             
-            categorized_words = categorize_words(
-                pdf_text, 
-                language, 
-                min_length=min_word_length, 
-                word_types=word_types,  # Use the selected word types
-                existing_words=existing_words_set  # Pass existing words for de-duplication
+            analysis = None
+            categorized_words = get_cached_categories(
+                text_digest,
+                language,
+                min_length=min_word_length,
+                word_types=word_types
             )
+            if categorized_words is None:
+                # Analyze page by page, keeping only a batch of pages in the pipeline
+                analysis = analyze_pages(page_texts, language, profile="categorize")
+                categorized_words = categorize_words(
+                    pdf_text, 
+                    language, 
+                    min_length=min_word_length, 
+                    word_types=word_types,  # Use the selected word types
+                    existing_words=existing_words_set,  # Pass existing words for de-duplication
+                    analysis=analysis,
+                    text_digest=text_digest
+                )
             st.session_state.extracted_words = categorized_words
             
             # Extract all words from all categories for sentence extraction
@@ -379,28 +422,41 @@ if uploaded_file is not None:
             for category, words in categorized_words.items():
                 all_words.extend(words)
             
-            # Find sentences containing these words
+            # Find sentences containing these words, reusing the analysis's sentence index
             status_text.text("Extracting example sentences...")
-            word_sentences = find_word_sentences(pdf_text, all_words)
+            if analysis is not None:
+                word_sentences = analysis.find_word_sentences(all_words)
+            else:
+                word_sentences = find_word_sentences(pdf_text, all_words)
             st.session_state.word_sentences = word_sentences
             
             progress_bar.progress(40)
             
             # Step 3: Compare with existing decks
             status_text.text("Comparing with existing decks...")
+            deck_load_report = {}
             new_words, existing_words = compare_with_existing_decks(
                 categorized_words, 
-                selected_decks
+                selected_decks,
+                language,
+                load_report=deck_load_report
             )
+            skipped_decks = [
+                f"{os.path.basename(deck_path)} ({info['status']} after {info['seconds']:.1f}s)"
+                for deck_path, info in deck_load_report.items()
+                if info['status'] in ("timeout", "error")
+            ]
+            if skipped_decks:
+                st.warning(f"Some selected decks could not be loaded and were skipped: {', '.join(skipped_decks)}")
             st.session_state.new_words = new_words
             st.session_state.existing_words = existing_words
             progress_bar.progress(60)
             
             # Step 4: Generate audio for new words (if enabled)
             if audio_enabled:
-                status_text.text("Generating audio for new words (this may take some time due to API rate limits)...")
+                status_text.text("Generating audio for new words (this may take some time for large decks)...")
                 # Display a note about rate limiting
-                st.info("⚠️ Due to API rate limits, only a subset of words (max 50 per category) will have audio generated. This helps prevent 429 (Too Many Requests) errors.")
+                st.info("Audio is generated for every new word, several at a time; requests are paced to stay within the text-to-speech API rate limits.")
                 # Use the audio output directory if specified
                 if save_audio_locally and audio_output_dir:
                     # Create a subdirectory for this specific deck
@@ -532,8 +588,8 @@ if uploaded_file is not None:
                 
                 if st.button("Generate Anki Deck"):
                     if audio_enabled:
-                        st.info("⚠️ Due to API rate limits, only a subset of words (max 50 per category) will have audio generated. This helps prevent 429 (Too Many Requests) errors.")
-                        with st.spinner("Generating audio for words (this may take some time due to API rate limits)..."):
+                        st.info("Audio is generated for every new word, several at a time; requests are paced to stay within the text-to-speech API rate limits.")
+                        with st.spinner("Generating audio for words (this may take some time for large decks)..."):
                             # Use the audio output directory if specified
                             if save_audio_locally and audio_output_dir:
                                 # Create a subdirectory for this specific deck
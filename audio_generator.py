@@ -1,11 +1,70 @@
 import os
+import time
 import tempfile
-from typing import Dict, List, Optional
-from gtts import gTTS
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from gtts import gTTS, gTTSError
+from rate_limiter import RateLimited, get_rate_limiter, parse_retry_after
 
 # Import Google Cloud TTS functionality
 from gcloud_tts import is_gcloud_tts_available, generate_audio_gcloud
 
+# Number of words synthesized at once by generate_audio_for_words/generate_audio_batch
+AUDIO_WORKERS = int(os.environ.get("AUDIO_WORKERS", "8"))
+
+# Maximum requests in flight per provider, on top of each provider's rate limit;
+# override with AUDIO_CONCURRENCY_<PROVIDER>, e.g. AUDIO_CONCURRENCY_GTTS=4
+PROVIDER_CONCURRENCY = {
+    "gcloud_tts": 8,
+    "gtts": 2
+}
+
+# Extra attempts for a word whose audio generation failed (throttling is retried by the rate limiter)
+AUDIO_RETRIES = 2
+
+# Seconds before the first retry of a failed word; doubles with each attempt
+AUDIO_RETRY_DELAY = 0.5
+
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_provider_semaphores_lock = threading.Lock()
+
+def get_provider_semaphore(provider: str) -> threading.BoundedSemaphore:
+    """
+    Get the process-wide semaphore bounding concurrent requests to a provider.
+    
+    Args:
+        provider: Provider name (see PROVIDER_CONCURRENCY)
+        
+    Returns:
+        Shared semaphore
+    """
+    with _provider_semaphores_lock:
+        if provider not in _provider_semaphores:
+            limit = int(os.environ.get(f"AUDIO_CONCURRENCY_{provider.upper()}", PROVIDER_CONCURRENCY.get(provider, 1)))
+            _provider_semaphores[provider] = threading.BoundedSemaphore(max(1, limit))
+        return _provider_semaphores[provider]
+
+def save_gtts_audio(word: str, lang: str, path: str) -> None:
+    """
+    Synthesize a word with gTTS under the shared gTTS rate limit.
+    
+    Args:
+        word: The word to synthesize
+        lang: gTTS language code
+        path: Path of the MP3 file to write
+    """
+    def synthesize():
+        try:
+            gTTS(text=word, lang=lang, slow=False).save(path)
+        except gTTSError as e:
+            if e.rsp is not None and e.rsp.status_code == 429:
+                raise RateLimited(parse_retry_after(e.rsp.headers.get("Retry-After")), str(e))
+            raise
+    
+    with get_provider_semaphore("gtts"):
+        get_rate_limiter("gtts").call(synthesize)
+
 def generate_audio_for_word(word: str, language: str, output_dir: Optional[str] = None) -> Optional[str]:
     """
     Generate audio for a single word using either Google Cloud Text-to-Speech (if available)
@@ -36,7 +95,8 @@ def generate_audio_for_word(word: str, language: str, output_dir: Optional[str]
     # First try using Google Cloud TTS if available
     if is_gcloud_tts_available():
         try:
-            gcloud_audio_path = generate_audio_gcloud(word, lang_info["gcloud"], output_dir)
+            with get_provider_semaphore("gcloud_tts"):
+                gcloud_audio_path = generate_audio_gcloud(word, lang_info["gcloud"], output_dir)
             if gcloud_audio_path:
                 return gcloud_audio_path
         except Exception as e:
@@ -55,16 +115,14 @@ def generate_audio_for_word(word: str, language: str, output_dir: Optional[str]
             audio_file_path = os.path.join(output_dir, audio_filename)
             
             # Generate the audio using gTTS
-            tts = gTTS(text=word, lang=lang_info["gtts"], slow=False)
-            tts.save(audio_file_path)
+            save_gtts_audio(word, lang_info["gtts"], audio_file_path)
         else:
             # Use a temporary file if no output directory is specified
             fd, temp_path = tempfile.mkstemp(suffix='.mp3')
             os.close(fd)
             
             # Generate the audio using gTTS
-            tts = gTTS(text=word, lang=lang_info["gtts"], slow=False)
-            tts.save(temp_path)
+            save_gtts_audio(word, lang_info["gtts"], temp_path)
             audio_file_path = temp_path
         
         return audio_file_path
@@ -73,6 +131,78 @@ def generate_audio_for_word(word: str, language: str, output_dir: Optional[str]
         print(f"Error generating audio for '{word}': {str(e)}")
         return None
 
+def generate_audio_with_retry(word: str, language: str, output_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Generate audio for a word, retrying failures with exponential backoff.
+    
+    Args:
+        word: The word to generate audio for
+        language: Language of the word
+        output_dir: Optional directory to save the audio file to
+        
+    Returns:
+        Path to the generated audio file or None if every attempt failed
+    """
+    for attempt in range(AUDIO_RETRIES + 1):
+        audio_path = generate_audio_for_word(word, language, output_dir)
+        if audio_path:
+            return audio_path
+        if attempt < AUDIO_RETRIES:
+            time.sleep(AUDIO_RETRY_DELAY * 2 ** attempt)
+    return None
+
+def run_audio_jobs(
+    jobs: List[Tuple[str, Optional[str]]],
+    language: str,
+    workers: int = AUDIO_WORKERS,
+    label: str = "words"
+) -> Dict[str, str]:
+    """
+    Synthesize audio for many words on a bounded worker pool.
+    
+    Each provider's requests are additionally bounded by its semaphore and rate
+    limiter, so more workers never means more throttling.
+    
+    Args:
+        jobs: List of (word, output directory or None) pairs; repeated words are synthesized once
+        language: Language of the words
+        workers: Number of words synthesized at once
+        label: Description used in progress messages
+        
+    Returns:
+        Dictionary mapping words to audio file paths (words that failed are left out)
+    """
+    audio_files = {}
+    unique_jobs = {}
+    for word, output_dir in jobs:
+        unique_jobs.setdefault(word, output_dir)
+    total_words = len(unique_jobs)
+    if not total_words:
+        return audio_files
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, total_words))) as executor:
+        futures = {
+            executor.submit(generate_audio_with_retry, word, language, output_dir): word
+            for word, output_dir in unique_jobs.items()
+        }
+        for processed_count, future in enumerate(as_completed(futures), 1):
+            word = futures[future]
+            try:
+                audio_path = future.result()
+            except Exception as e:
+                print(f"Error generating audio for '{word}': {str(e)}")
+                audio_path = None
+            
+            # Store the audio path if generation was successful
+            if audio_path:
+                audio_files[word] = audio_path
+            
+            # Show progress
+            if processed_count % 10 == 0:
+                print(f"Generated audio for {processed_count}/{total_words} {label}...")
+    
+    return audio_files
+
 def generate_audio_for_words(words_dict: Dict[str, List[str]], language: str, output_dir: Optional[str] = None) -> Dict[str, str]:
     """
     Generate audio for multiple words.
@@ -85,13 +215,7 @@ def generate_audio_for_words(words_dict: Dict[str, List[str]], language: str, ou
     Returns:
         Dictionary mapping words to audio file paths
     """
-    audio_files = {}
-    
-    # Process all words in all categories with rate limit handling
-    import time
-    total_words = sum(len(words) for words in words_dict.values())
-    processed_count = 0
-    
+    jobs = []
     for category, words in words_dict.items():
         # Create category subdirectory if output_dir is specified
         category_dir = None
@@ -99,26 +223,9 @@ def generate_audio_for_words(words_dict: Dict[str, List[str]], language: str, ou
             category_dir = os.path.join(output_dir, category.replace(' ', '_'))
             os.makedirs(category_dir, exist_ok=True)
         
-        # Process only a subset of words per category to avoid rate limiting (max 50 words)
-        words_to_process = words[:min(50, len(words))]
-        for word in words_to_process:
-            # Generate audio for the word
-            audio_path = generate_audio_for_word(word, language, category_dir)
-            
-            # Store the audio path if generation was successful
-            if audio_path:
-                audio_files[word] = audio_path
-            
-            # Add a small delay between requests to avoid rate limiting
-            processed_count += 1
-            if processed_count % 5 == 0:  # Add delay every 5 words
-                time.sleep(1)  # Sleep for 1 second
-            
-            # Show progress
-            if processed_count % 10 == 0:
-                print(f"Generated audio for {processed_count}/{total_words} words...")
+        jobs.extend((word, category_dir) for word in words)
     
-    return audio_files
+    return run_audio_jobs(jobs, language)
 
 def generate_audio_batch(words: List[str], language: str, output_dir: Optional[str] = None) -> Dict[str, str]:
     """
@@ -132,24 +239,4 @@ def generate_audio_batch(words: List[str], language: str, output_dir: Optional[s
     Returns:
         Dictionary mapping words to audio file paths
     """
-    audio_files = {}
-    import time
-    
-    # Limit to max 50 words per batch
-    words_to_process = words[:min(50, len(words))]
-    total_words = len(words_to_process)
-    
-    for i, word in enumerate(words_to_process):
-        audio_path = generate_audio_for_word(word, language, output_dir)
-        if audio_path:
-            audio_files[word] = audio_path
-        
-        # Add a small delay between requests to avoid rate limiting
-        if i % 5 == 0 and i > 0:  # Add delay every 5 words
-            time.sleep(1)  # Sleep for 1 second
-        
-        # Show progress
-        if i % 10 == 0 and i > 0:
-            print(f"Generated audio for {i}/{total_words} words in batch...")
-    
-    return audio_files
+    return run_audio_jobs([(word, output_dir) for word in words], language, label="words in batch")
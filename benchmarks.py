@@ -0,0 +1,580 @@
+import argparse
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+# Default PDF used as benchmark input
+SAMPLE_PDF = "sample.pdf"
+
+def load_sample_text(pdf_path: str = SAMPLE_PDF) -> str:
+    """
+    Load the benchmark input text from a PDF.
+
+    Args:
+        pdf_path: Path to the PDF to extract text from
+
+    Returns:
+        Extracted text
+    """
+    from pdf_processor import extract_text_from_pdf
+
+    return extract_text_from_pdf(pdf_path)
+
+def benchmark_extraction_profiles(
+    languages: List[str],
+    text: Optional[str] = None,
+    repeats: int = 3
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure spaCy throughput (tokens/second) for each extraction profile.
+
+    The "full" profile runs the complete pipeline and is the baseline the
+    pruned profiles are compared against.
+
+    Args:
+        languages: Language names to benchmark
+        text: Text to process (defaults to the sample PDF text)
+        repeats: Number of timed runs per profile; the fastest is reported
+
+    Returns:
+        Dictionary mapping each language to a dictionary of profile -> tokens/second
+    """
+    from nlp_processor import EXTRACTION_PROFILES, load_language_model, split_text_into_chunks
+
+    if text is None:
+        text = load_sample_text()
+    chunks = split_text_into_chunks(text)
+
+    results = {}
+    for language in languages:
+        results[language] = {}
+        for profile in EXTRACTION_PROFILES:
+            nlp = load_language_model(language, profile=profile)
+            best_time = None
+            token_count = 0
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                token_count = sum(len(doc) for doc in nlp.pipe(chunks))
+                elapsed = time.perf_counter() - start_time
+                best_time = elapsed if best_time is None else min(best_time, elapsed)
+            results[language][profile] = token_count / best_time if best_time else 0.0
+            print(f"{language:10} {profile:12} {nlp.pipe_names} {results[language][profile]:,.0f} tokens/s")
+
+    return results
+
+def _find_word_sentences_by_scan(sentences: List[str], words: List[str]) -> Dict[str, List[str]]:
+    """
+    Previous find_word_sentences: one regex per word, scanned over every sentence.
+
+    Args:
+        sentences: Sentences of the text
+        words: List of words to find sentences for
+
+    Returns:
+        Dictionary mapping each word to a list of sentences that contain it
+    """
+    word_sentences = {word: [] for word in words}
+    for word in words:
+        regex = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+        for sentence in sentences:
+            if regex.search(sentence):
+                if len(word_sentences[word]) < 5:
+                    word_sentences[word].append(sentence)
+    return word_sentences
+
+def benchmark_sentence_lookup(text: Optional[str] = None, copies: int = 20) -> Dict[str, float]:
+    """
+    Compare the regex scan with the inverted sentence index in find_word_sentences.
+
+    Every distinct word of 3+ letters in the text is looked up, like the candidate
+    words produced by categorize_words.
+
+    Args:
+        text: Text to search (defaults to the sample PDF text)
+        copies: Number of times the text is repeated to simulate a longer book
+
+    Returns:
+        Dictionary with the seconds taken by each implementation
+    """
+    from pdf_processor import build_sentence_index, extract_sentences, find_word_sentences
+
+    if text is None:
+        text = load_sample_text()
+    text = " ".join([text] * copies)
+    sentences = extract_sentences(text)
+    words = sorted({word.lower() for word in re.findall(r'\w{3,}', text)})
+
+    start_time = time.perf_counter()
+    expected = _find_word_sentences_by_scan(sentences, words)
+    scan_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    actual = find_word_sentences(text, words, sentences=sentences, sentence_index=build_sentence_index(sentences))
+    index_seconds = time.perf_counter() - start_time
+
+    mismatches = sum(1 for word in words if expected[word] != actual[word])
+    print(f"{len(words)} words x {len(sentences)} sentences: scan {scan_seconds:.3f}s, "
+          f"index {index_seconds:.3f}s ({scan_seconds / max(index_seconds, 1e-9):.0f}x), {mismatches} mismatching words")
+    return {"scan": scan_seconds, "index": index_seconds}
+
+def build_media_heavy_deck(output_path: str, note_count: int = 2000, media_mb: int = 200) -> str:
+    """
+    Write a synthetic Spanish deck with one incompressible audio file per note.
+
+    Args:
+        output_path: Path of the .apkg file to write
+        note_count: Number of notes in the deck
+        media_mb: Total size of the media files in megabytes (0 for no media)
+
+    Returns:
+        Path to the written deck
+    """
+    import tempfile
+    import genanki
+    from anki_manager import generate_anki_model
+
+    model = generate_anki_model("Spanish")
+    deck = genanki.Deck(1234567890, "Benchmark Deck")
+    media_size = media_mb * 1024 * 1024 // note_count
+
+    with tempfile.TemporaryDirectory() as media_dir:
+        media_files = []
+        for i in range(note_count):
+            audio = ""
+            if media_size:
+                media_path = os.path.join(media_dir, f"palabra{i}.mp3")
+                with open(media_path, "wb") as f:
+                    f.write(os.urandom(media_size))
+                media_files.append(media_path)
+                audio = f"[sound:palabra{i}.mp3]"
+            deck.add_note(genanki.Note(model=model, fields=[
+                f"palabra{i}", f"word{i}", "nouns", "", audio
+            ]))
+
+        package = genanki.Package(deck)
+        package.media_files = media_files
+        package.write_to_file(output_path)
+
+    return output_path
+
+def benchmark_apkg_collection(deck_path: Optional[str] = None, repeats: int = 3) -> Dict[str, float]:
+    """
+    Compare extracting a whole .apkg with reading only its collection database.
+
+    Args:
+        deck_path: Deck to read (defaults to a generated media-heavy deck)
+        repeats: Number of timed runs per approach; the fastest is reported
+
+    Returns:
+        Dictionary with the seconds taken by each approach
+    """
+    import sqlite3
+    import tempfile
+    import zipfile
+    from deck_storage import open_apkg_collection
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if deck_path is None:
+            deck_path = build_media_heavy_deck(os.path.join(work_dir, "benchmark.apkg"))
+
+        def extract_all() -> int:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with zipfile.ZipFile(deck_path, "r") as zip_ref:
+                    zip_ref.extractall(temp_dir)
+                conn = sqlite3.connect(os.path.join(temp_dir, "collection.anki2"))
+                try:
+                    return conn.execute("SELECT count(*) FROM notes").fetchone()[0]
+                finally:
+                    conn.close()
+
+        def collection_only() -> int:
+            with open_apkg_collection(deck_path) as conn:
+                return conn.execute("SELECT count(*) FROM notes").fetchone()[0]
+
+        results = {}
+        for name, approach in [("extractall", extract_all), ("collection_only", collection_only)]:
+            timings = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                note_count = approach()
+                timings.append(time.perf_counter() - start_time)
+            results[name] = min(timings)
+            print(f"{name:16} {results[name]:.3f}s ({note_count} notes)")
+
+        print(f"Deck size: {os.path.getsize(deck_path) / (1024 * 1024):.0f} MB, "
+              f"speedup: {results['extractall'] / max(results['collection_only'], 1e-9):.0f}x")
+    return results
+
+def benchmark_known_words(word_count: int = 200000, lookups: int = 5000) -> Dict[str, float]:
+    """
+    Measure memory and time of the known-word set used by compare_with_existing_decks
+    against rebuilding the vocabulary (plus a lowercased copy) on every comparison.
+
+    Args:
+        word_count: Number of distinct words in the synthetic deck library
+        lookups: Number of candidate words compared per run
+
+    Returns:
+        Dictionary with the seconds and peak bytes of each approach
+    """
+    import json
+    import random
+    import tempfile
+    import tracemalloc
+    import deck_storage
+    from deck_index import get_language_words
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyzáéíóúñ"
+    words = set()
+    while len(words) < word_count:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 12))))
+    words = sorted(words)
+    candidates = rng.sample(words, lookups // 2) + [f"nueva{i}" for i in range(lookups - lookups // 2)]
+
+    original_storage_dir = deck_storage.DECK_STORAGE_DIR
+    with tempfile.TemporaryDirectory() as storage_dir:
+        deck_storage.DECK_STORAGE_DIR = storage_dir
+        try:
+            # Split the library over 20 decks like a real collection
+            deck_size = word_count // 20 + 1
+            for i in range(0, word_count, deck_size):
+                json_path = os.path.join(storage_dir, f"words{i}.json")
+                with open(json_path, "w", encoding="utf-8") as f:
+                    json.dump({"nouns": words[i:i + deck_size]}, f, ensure_ascii=False)
+                deck_storage.save_deck_to_storage(json_path, f"Spanish_Benchmark_{i}")
+                os.remove(json_path)
+
+            def rebuild_per_run() -> int:
+                all_existing_words = get_language_words(storage_dir, "Spanish")
+                all_existing_words_lower = {word.lower() for word in all_existing_words}
+                return sum(1 for word in candidates if word.lower() in all_existing_words_lower)
+
+            def shared_set() -> int:
+                known_words = deck_storage.get_known_words("Spanish")
+                return sum(1 for word in candidates if word.lower() in known_words)
+
+            results = {}
+            for name, approach in [("rebuild", rebuild_per_run), ("shared_set", shared_set)]:
+                for run in ("cold", "warm"):
+                    tracemalloc.start()
+                    start_time = time.perf_counter()
+                    found = approach()
+                    elapsed = time.perf_counter() - start_time
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    results[f"{name}_{run}_seconds"] = elapsed
+                    results[f"{name}_{run}_peak_bytes"] = peak
+                    print(f"{name:10} {run:4} {elapsed:.3f}s, peak {peak / (1024 * 1024):.1f} MB allocated ({found} known)")
+
+            stats = deck_storage.get_known_words_stats()
+            results["shared_set_bytes"] = stats["bytes"]
+            print(f"Resident known-word set: {stats['words']:,} words, {stats['bytes'] / (1024 * 1024):.1f} MB")
+        finally:
+            deck_storage.DECK_STORAGE_DIR = original_storage_dir
+    return results
+
+def benchmark_apkg_words(deck_path: Optional[str] = None, note_count: int = 50000) -> float:
+    """
+    Measure extract_words_from_apkg on a large deck.
+
+    Args:
+        deck_path: Deck to read (defaults to a generated deck without media)
+        note_count: Number of notes in the generated deck
+
+    Returns:
+        Seconds taken to extract the words
+    """
+    import tempfile
+    from deck_storage import extract_words_from_apkg
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if deck_path is None:
+            deck_path = build_media_heavy_deck(os.path.join(work_dir, "benchmark.apkg"), note_count, media_mb=0)
+
+        start_time = time.perf_counter()
+        words_dict = extract_words_from_apkg(deck_path)
+        elapsed = time.perf_counter() - start_time
+
+    print(f"Extracted {sum(len(words) for words in words_dict.values())} words in {elapsed:.3f}s")
+    return elapsed
+
+def benchmark_deck_save(note_count: int = 2000) -> Dict[str, float]:
+    """
+    Save a generated deck the way create_anki_deck does (a deck name without an
+    extension) and check that it is listed with its words and that its blob is intact.
+
+    Args:
+        note_count: Number of notes in the generated deck
+
+    Returns:
+        Dictionary with the seconds taken to save and to list the deck
+
+    Raises:
+        RuntimeError: If the stored deck, its word list or its blob is broken
+    """
+    import tempfile
+    import zipfile
+    import deck_storage
+
+    original_storage_dir = deck_storage.DECK_STORAGE_DIR
+    with tempfile.TemporaryDirectory() as work_dir:
+        deck_storage.DECK_STORAGE_DIR = os.path.join(work_dir, "stored_decks")
+        try:
+            deck_path = build_media_heavy_deck(os.path.join(work_dir, "New_Spanish_Words_20260101_000000.apkg"),
+                                               note_count, media_mb=0)
+            content_hash = deck_storage.get_file_hash(deck_path)
+
+            start_time = time.perf_counter()
+            stored_path = deck_storage.save_deck_to_storage(deck_path, "New_Spanish_Words")
+            save_seconds = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            stored_decks = deck_storage.get_stored_decks("Spanish")
+            list_seconds = time.perf_counter() - start_time
+
+            listed = [deck for deck in stored_decks if deck["path"] == stored_path]
+            if not listed:
+                raise RuntimeError(f"Saved deck {stored_path} is missing from get_stored_decks")
+            if not zipfile.is_zipfile(stored_path):
+                raise RuntimeError(f"Saved deck {stored_path} is not an .apkg package")
+            if listed[0]["word_count"] != note_count:
+                raise RuntimeError(f"Saved deck lists {listed[0]['word_count']} words, expected {note_count}")
+            blob_path = os.path.join(deck_storage.get_blob_dir(), content_hash)
+            if os.path.exists(blob_path) and deck_storage.get_file_hash(blob_path) != content_hash:
+                raise RuntimeError(f"Blob {content_hash} no longer matches its content")
+        finally:
+            deck_storage.DECK_STORAGE_DIR = original_storage_dir
+
+    print(f"Saved {os.path.basename(stored_path)} in {save_seconds:.3f}s, "
+          f"listed with {listed[0]['word_count']} words in {list_seconds:.3f}s")
+    return {"save_seconds": save_seconds, "list_seconds": list_seconds}
+
+def start_translation_stand_in(latency: float = 0.005):
+    """
+    Start a local HTTP server that mimics the Sonnet translate endpoints.
+
+    "Translations" are the input text with an "-en" suffix. Each request waits
+    for latency seconds to stand in for the network round trip to the real API.
+
+    Args:
+        latency: Seconds added to every request
+
+    Returns:
+        Tuple of (running server, base URL to pass as SONNET_API_URL)
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps connections alive, like the real API; without TCP_NODELAY
+        # the separate header and body writes would stall on delayed ACKs
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            time.sleep(latency)
+            if self.path.endswith("/translate/batch"):
+                body = {"translations": [f"{text}-en" for text in payload["texts"]]}
+            elif self.path.endswith("/translate"):
+                body = {"translation": f"{payload['text']}-en"}
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def benchmark_translation(word_count: int = 500, latency: float = 0.005) -> Dict[str, float]:
+    """
+    Compare per-word requests without a session, per-word requests on the pooled
+    SonnetTranslator session, and batch requests, against the local stand-in server.
+
+    Args:
+        word_count: Number of words to translate
+        latency: Seconds the stand-in server adds to every request
+
+    Returns:
+        Dictionary with the words/second of each approach
+    """
+    import requests
+    from sonnet_translator import SonnetTranslator
+
+    # The stand-in has no quota; don't let the sonnet rate limiter pace the comparison
+    os.environ.setdefault("RATE_LIMIT_SONNET", "1000000")
+
+    server, base_url = start_translation_stand_in(latency)
+    words = [f"palabra{i}" for i in range(word_count)]
+    translator = SonnetTranslator(api_key="benchmark", base_url=base_url)
+
+    def bare_requests() -> int:
+        translated = 0
+        for word in words:
+            response = requests.post(
+                f"{base_url}/translate",
+                headers={"Authorization": "Bearer benchmark", "Connection": "close"},
+                json={"text": word, "source_lang": "es", "target_lang": "en"}
+            )
+            translated += response.json()["translation"] is not None
+        return translated
+
+    def pooled_session() -> int:
+        return sum(translator.translate(word) is not None for word in words)
+
+    def batched() -> int:
+        return sum(translation is not None for translation in translator.translate_batch(words).values())
+
+    results = {}
+    try:
+        for name, approach in [("bare_requests", bare_requests), ("pooled_session", pooled_session), ("batched", batched)]:
+            start_time = time.perf_counter()
+            translated = approach()
+            elapsed = time.perf_counter() - start_time
+            results[name] = translated / elapsed if elapsed else 0.0
+            print(f"{name:15} {elapsed:.3f}s, {results[name]:,.0f} words/s")
+    finally:
+        translator.close()
+        server.shutdown()
+    return results
+
+def benchmark_tts_client(word_count: int = 200, client_setup: float = 0.05) -> Dict[str, float]:
+    """
+    Measure the per-word overhead of Google Cloud TTS client handling with a stubbed client.
+
+    The previous code built one client for is_gcloud_tts_available and another in
+    generate_audio_gcloud for every word; now one cached client serves all words.
+
+    Args:
+        word_count: Number of words to synthesize
+        client_setup: Seconds the stub client takes to construct (gRPC channel setup)
+
+    Returns:
+        Dictionary with the milliseconds per word of each approach
+    """
+    import tempfile
+    import gcloud_tts
+    from audio_generator import generate_audio_for_word
+
+    class StubResponse:
+        audio_content = b"ID3"
+
+    class StubClient:
+        created = 0
+
+        def __init__(self, *args, **kwargs):
+            time.sleep(client_setup)
+            StubClient.created += 1
+
+        def synthesize_speech(self, **kwargs):
+            return StubResponse()
+
+    def legacy_word(word: str, output_dir: str) -> None:
+        # is_gcloud_tts_available() built a client, then generate_audio_gcloud built another
+        StubClient()
+        client = StubClient()
+        response = client.synthesize_speech(input=word)
+        with open(os.path.join(output_dir, f"{word}_es_ES.mp3"), "wb") as audio_file:
+            audio_file.write(response.audio_content)
+
+    # The stub has no quota; don't let the gcloud_tts rate limiter pace the comparison
+    os.environ.setdefault("RATE_LIMIT_GCLOUD_TTS", "1000000")
+    original_client = gcloud_tts.texttospeech.TextToSpeechClient
+    original_credentials = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    words = [f"palabra{i}" for i in range(word_count)]
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        credentials_path = os.path.join(work_dir, "credentials.json")
+        with open(credentials_path, "w") as f:
+            f.write("{}")
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+        gcloud_tts.texttospeech.TextToSpeechClient = StubClient
+        gcloud_tts.reset_google_cloud_tts()
+        try:
+            for name, approach in [
+                ("client_per_word", lambda word: legacy_word(word, work_dir)),
+                ("cached_client", lambda word: generate_audio_for_word(word, "Spanish", work_dir))
+            ]:
+                StubClient.created = 0
+                start_time = time.perf_counter()
+                for word in words:
+                    approach(word)
+                elapsed = time.perf_counter() - start_time
+                results[name] = elapsed * 1000 / word_count
+                print(f"{name:16} {results[name]:.2f} ms/word, {StubClient.created} clients created")
+        finally:
+            gcloud_tts.texttospeech.TextToSpeechClient = original_client
+            gcloud_tts.reset_google_cloud_tts()
+            if original_credentials is None:
+                os.environ.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
+            else:
+                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = original_credentials
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    profiles_parser = subparsers.add_parser("profiles", help="spaCy throughput per extraction profile")
+    profiles_parser.add_argument("--languages", nargs="+", default=["Spanish", "French"])
+    profiles_parser.add_argument("--pdf", default=SAMPLE_PDF)
+    profiles_parser.add_argument("--repeats", type=int, default=3)
+
+    sentences_parser = subparsers.add_parser("sentences", help="find_word_sentences scan vs inverted index")
+    sentences_parser.add_argument("--pdf", default=SAMPLE_PDF)
+    sentences_parser.add_argument("--copies", type=int, default=20)
+
+    apkg_parser = subparsers.add_parser("apkg", help="extracting a whole .apkg vs reading only its collection")
+    apkg_parser.add_argument("--deck", default=None, help="Deck to read (default: generated media-heavy deck)")
+    apkg_parser.add_argument("--repeats", type=int, default=3)
+
+    apkg_words_parser = subparsers.add_parser("apkg-words", help="extract_words_from_apkg on a large deck")
+    apkg_words_parser.add_argument("--deck", default=None, help="Deck to read (default: generated deck without media)")
+    apkg_words_parser.add_argument("--notes", type=int, default=50000)
+
+    deck_save_parser = subparsers.add_parser("deck-save", help="app-style deck save, checked against get_stored_decks")
+    deck_save_parser.add_argument("--notes", type=int, default=2000)
+
+    known_words_parser = subparsers.add_parser("known-words", help="shared known-word set vs per-run vocabulary copies")
+    known_words_parser.add_argument("--words", type=int, default=200000)
+    known_words_parser.add_argument("--lookups", type=int, default=5000)
+
+    translation_parser = subparsers.add_parser("translation", help="translation requests against a local stand-in server")
+    translation_parser.add_argument("--words", type=int, default=500)
+    translation_parser.add_argument("--latency", type=float, default=0.005)
+
+    tts_client_parser = subparsers.add_parser("tts-client", help="per-word TTS client overhead with a stubbed client")
+    tts_client_parser.add_argument("--words", type=int, default=200)
+    tts_client_parser.add_argument("--client-setup", type=float, default=0.05)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "profiles":
+        benchmark_extraction_profiles(args.languages, load_sample_text(args.pdf), args.repeats)
+    elif args.benchmark == "sentences":
+        benchmark_sentence_lookup(load_sample_text(args.pdf), args.copies)
+    elif args.benchmark == "apkg":
+        benchmark_apkg_collection(args.deck, args.repeats)
+    elif args.benchmark == "known-words":
+        benchmark_known_words(args.words, args.lookups)
+    elif args.benchmark == "apkg-words":
+        benchmark_apkg_words(args.deck, args.notes)
+    elif args.benchmark == "deck-save":
+        benchmark_deck_save(args.notes)
+    elif args.benchmark == "translation":
+        benchmark_translation(args.words, args.latency)
+    elif args.benchmark == "tts-client":
+        benchmark_tts_client(args.words, args.client_setup)
@@ -0,0 +1,326 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# fcntl is only available on POSIX; elsewhere index_lock only serializes threads of this process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# The index lives in a subdirectory of the deck storage directory, so writing it
+# never changes the storage directory itself
+INDEX_DIR_NAME = ".index"
+INDEX_FILENAME = "decks.sqlite3"
+
+# Seconds to wait for another process holding a write lock on the index
+INDEX_TIMEOUT = 30
+
+# Advisory lock file serializing deck storage updates across worker processes
+LOCK_FILENAME = "storage.lock"
+
+# The lock is reentrant within a thread; the RLock keeps other threads of this
+# process out while the file lock is held
+_index_lock = threading.RLock()
+_index_lock_state = {"depth": 0, "file": None}
+
+# Index paths whose schema this process has already created or migrated
+_schema_ready: Set[str] = set()
+_schema_ready_lock = threading.Lock()
+
+def get_index_path(storage_dir: str) -> str:
+    """
+    Get the path of the deck index database for a storage directory.
+
+    Args:
+        storage_dir: Deck storage directory
+
+    Returns:
+        Path to the SQLite index file
+    """
+    return os.path.join(storage_dir, INDEX_DIR_NAME, INDEX_FILENAME)
+
+@contextmanager
+def index_lock(storage_dir: str) -> Iterator[None]:
+    """
+    Hold the exclusive advisory lock on a deck storage directory.
+
+    Worker processes take this lock around every change to stored decks and the
+    index, so they never interleave writes or rebuild the same data twice.
+    Nested use from the same thread is allowed.
+
+    Args:
+        storage_dir: Deck storage directory
+    """
+    with _index_lock:
+        if _index_lock_state["depth"] == 0:
+            lock_path = os.path.join(storage_dir, INDEX_DIR_NAME, LOCK_FILENAME)
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            lock_file = open(lock_path, "a")
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            _index_lock_state["file"] = lock_file
+        _index_lock_state["depth"] += 1
+        try:
+            yield
+        finally:
+            _index_lock_state["depth"] -= 1
+            if _index_lock_state["depth"] == 0:
+                lock_file = _index_lock_state["file"]
+                _index_lock_state["file"] = None
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                lock_file.close()
+
+def connect_index(storage_dir: str) -> sqlite3.Connection:
+    """
+    Open the deck index, creating it if needed.
+
+    The schema is created (or migrated) only the first time this process opens
+    an index; later calls just open a connection.
+
+    Args:
+        storage_dir: Deck storage directory
+
+    Returns:
+        Open SQLite connection
+    """
+    index_path = get_index_path(storage_dir)
+    with _schema_ready_lock:
+        schema_ready = index_path in _schema_ready
+    if schema_ready and os.path.exists(index_path):
+        return sqlite3.connect(index_path, timeout=INDEX_TIMEOUT)
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    conn = sqlite3.connect(index_path, timeout=INDEX_TIMEOUT)
+    _create_schema(conn)
+    with _schema_ready_lock:
+        _schema_ready.add(index_path)
+    return conn
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """
+    Create the index tables, adding columns missing from older indexes.
+
+    Args:
+        conn: Open connection to the deck index
+    """
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS vocabulary (
+            deck TEXT NOT NULL,
+            language TEXT NOT NULL,
+            word TEXT NOT NULL,
+            PRIMARY KEY (deck, word)
+        );
+        CREATE INDEX IF NOT EXISTS vocabulary_language_word ON vocabulary (language, word);
+        CREATE TABLE IF NOT EXISTS manifest (
+            filename TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            language TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            word_count INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            json_size INTEGER,
+            json_mtime_ns INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """)
+
+    # Indexes created before the manifest tracked companion JSON files lack its columns;
+    # their entries read as NULL and are re-read by the next full rescan
+    manifest_columns = {row[1] for row in conn.execute("PRAGMA table_info(manifest)")}
+    for column in ("json_size", "json_mtime_ns"):
+        if column not in manifest_columns:
+            conn.execute(f"ALTER TABLE manifest ADD COLUMN {column} INTEGER")
+    conn.commit()
+
+@contextmanager
+def index_connection(storage_dir: str, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Use the caller's connection to the deck index, or open one for the duration of the block.
+
+    Lets callers run several index queries of one operation on a single connection.
+
+    Args:
+        storage_dir: Deck storage directory
+        conn: Open connection to reuse (left open afterwards)
+    """
+    if conn is not None:
+        yield conn
+        return
+    with closing(connect_index(storage_dir)) as conn:
+        yield conn
+
+def _bump_vocabulary_generation(conn: sqlite3.Connection) -> None:
+    """
+    Increment the vocabulary generation inside the caller's transaction, so
+    in-memory copies of the vocabulary can tell they are stale.
+
+    Args:
+        conn: Open connection to the deck index
+    """
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('vocabulary_generation', '1') "
+        "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+    )
+
+def get_vocabulary_generation(storage_dir: str, conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Get the vocabulary generation, which changes whenever deck words are indexed or removed.
+
+    Args:
+        storage_dir: Deck storage directory
+        conn: Open connection to the deck index to reuse
+
+    Returns:
+        Generation number (0 if the vocabulary was never written)
+    """
+    with index_connection(storage_dir, conn) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'vocabulary_generation'").fetchone()
+        return int(row[0]) if row else 0
+
+def normalize_deck_words(words_dict: Dict[str, List[str]]) -> Set[str]:
+    """
+    Flatten a deck's categorized words into a set of lowercase words.
+    Normalized adjectives (word/wordFeminine) contribute both forms.
+
+    Args:
+        words_dict: Dictionary of categorized words
+
+    Returns:
+        Set of lowercase words
+    """
+    words = set()
+    for category_words in words_dict.values():
+        for word in category_words:
+            words.update(part.lower() for part in word.split('/'))
+    return words
+
+def index_deck_words(
+    storage_dir: str,
+    deck: str,
+    language: str,
+    words_dict: Optional[Dict[str, List[str]]],
+    conn: Optional[sqlite3.Connection] = None
+) -> None:
+    """
+    Add or replace a deck's words in the vocabulary index.
+
+    Args:
+        storage_dir: Deck storage directory
+        deck: Filename of the stored deck
+        language: Language of the deck
+        words_dict: Dictionary of categorized words, or None if the deck has no word list
+        conn: Open connection to the deck index to reuse
+    """
+    words = normalize_deck_words(words_dict) if words_dict else set()
+    with index_connection(storage_dir, conn) as conn, conn:
+        conn.execute("DELETE FROM vocabulary WHERE deck = ?", (deck,))
+        conn.executemany(
+            "INSERT INTO vocabulary (deck, language, word) VALUES (?, ?, ?)",
+            ((deck, language, word) for word in words)
+        )
+        _bump_vocabulary_generation(conn)
+
+def remove_deck_words(storage_dir: str, decks: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> None:
+    """
+    Remove decks and their words from the vocabulary index.
+
+    Args:
+        storage_dir: Deck storage directory
+        decks: Filenames of the stored decks
+        conn: Open connection to the deck index to reuse
+    """
+    decks = [(deck,) for deck in decks]
+    with index_connection(storage_dir, conn) as conn, conn:
+        conn.executemany("DELETE FROM vocabulary WHERE deck = ?", decks)
+        if decks:
+            _bump_vocabulary_generation(conn)
+
+def get_language_words(storage_dir: str, language: str, conn: Optional[sqlite3.Connection] = None) -> Set[str]:
+    """
+    Get all known words of a language from the vocabulary index.
+
+    Args:
+        storage_dir: Deck storage directory
+        language: Language of the decks
+        conn: Open connection to the deck index to reuse
+
+    Returns:
+        Set of lowercase words
+    """
+    with index_connection(storage_dir, conn) as conn:
+        rows = conn.execute("SELECT DISTINCT word FROM vocabulary WHERE language = ?", (language,))
+        return {row[0] for row in rows}
+
+MANIFEST_COLUMNS = [
+    "filename", "name", "language", "timestamp", "word_count", "size", "mtime_ns", "content_hash",
+    "json_size", "json_mtime_ns"
+]
+
+def get_manifest_entries(storage_dir: str, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """
+    Get the metadata of all decks in the manifest.
+
+    Args:
+        storage_dir: Deck storage directory
+        conn: Open connection to the deck index to reuse
+
+    Returns:
+        List of dictionaries with the MANIFEST_COLUMNS keys
+    """
+    with index_connection(storage_dir, conn) as conn:
+        rows = conn.execute(f"SELECT {', '.join(MANIFEST_COLUMNS)} FROM manifest")
+        return [dict(zip(MANIFEST_COLUMNS, row)) for row in rows]
+
+def update_manifest(
+    storage_dir: str,
+    entries: Iterable[Dict[str, Any]] = (),
+    removed: Iterable[str] = (),
+    storage_mtime_ns: Optional[int] = None,
+    conn: Optional[sqlite3.Connection] = None
+) -> None:
+    """
+    Add, replace and remove manifest entries in a single transaction.
+
+    Args:
+        storage_dir: Deck storage directory
+        entries: Dictionaries with the MANIFEST_COLUMNS keys to add or replace
+        removed: Filenames of decks to remove
+        storage_mtime_ns: Storage directory mtime the manifest now reflects, if it was fully rescanned
+        conn: Open connection to the deck index to reuse
+    """
+    with index_connection(storage_dir, conn) as conn, conn:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO manifest ({', '.join(MANIFEST_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in MANIFEST_COLUMNS)})",
+            ([entry[column] for column in MANIFEST_COLUMNS] for entry in entries)
+        )
+        conn.executemany("DELETE FROM manifest WHERE filename = ?", ((filename,) for filename in removed))
+        if storage_mtime_ns is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('storage_mtime_ns', ?)",
+                (str(storage_mtime_ns),)
+            )
+
+def get_manifest_storage_mtime(storage_dir: str, conn: Optional[sqlite3.Connection] = None) -> Optional[int]:
+    """
+    Get the storage directory mtime recorded by the last full manifest rescan.
+
+    Args:
+        storage_dir: Deck storage directory
+        conn: Open connection to the deck index to reuse
+
+    Returns:
+        Directory mtime in nanoseconds, or None if the manifest was never built
+    """
+    with index_connection(storage_dir, conn) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'storage_mtime_ns'").fetchone()
+        return int(row[0]) if row else None
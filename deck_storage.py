@@ -3,15 +3,208 @@ import shutil
 import json
 import time
 import re
-from typing import List, Dict, Any, Optional, Set, Tuple
+import sqlite3
+import zipfile
+import tempfile
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Any, FrozenSet, Optional, Set, Tuple
+from deck_index import (
+    index_lock, index_connection, index_deck_words, remove_deck_words, get_language_words,
+    get_vocabulary_generation, get_manifest_entries, update_manifest, get_manifest_storage_mtime
+)
+
+# zstandard is optional; it is only needed for decks exported by Anki 2.1.50+ (collection.anki21b)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# orjson is optional; it parses deck word lists several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# watchdog is optional; without it the deck watcher falls back to polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
 
 # Directory for storing decks permanently
 DECK_STORAGE_DIR = "stored_decks"
 
+# Content-addressed copies of stored deck files, named by their SHA-256 digest.
+# Named decks in DECK_STORAGE_DIR are hard links to these blobs.
+BLOB_DIR_NAME = ".blobs"
+
+# Collection databases an .apkg may contain, from newest to oldest format.
+# Newer exports also include a legacy collection.anki2 that only holds an "update Anki" note.
+APKG_COLLECTION_ENTRIES = ["collection.anki21b", "collection.anki21", "collection.anki2"]
+
+# Collections up to this size are loaded straight into memory; larger ones go to a temp file
+MAX_IN_MEMORY_COLLECTION_BYTES = 64 * 1024 * 1024
+
+# Notes fetched per batch when scanning a deck's collection
+APKG_NOTE_BATCH_SIZE = 1000
+
+# Matches HTML tags in note fields
+HTML_TAG_PATTERN = re.compile('<[^<]+?>')
+
+# Word-ending patterns used by categorize_word, in priority order (first match wins)
+SUFFIX_CATEGORY_RULES = [
+    ("verbs", ['ar', 'er', 'ir', 'arse', 'erse', 'irse']),
+    ("adverbs", ['mente']),
+    ("adjectives", ['o', 'a', 'os', 'as', 'oso', 'osa', 'ble']),
+    ("nouns", ['ción', 'sión', 'dad', 'tad', 'eza'])
+]
+
+# Suffix -> (priority, category) lookup built from SUFFIX_CATEGORY_RULES
+_SUFFIX_CATEGORIES: Dict[str, Tuple[int, str]] = {}
+for _priority, (_category, _suffixes) in enumerate(SUFFIX_CATEGORY_RULES):
+    for _suffix in _suffixes:
+        _SUFFIX_CATEGORIES.setdefault(_suffix, (_priority, _category))
+_SUFFIX_LENGTHS = sorted({len(suffix) for suffix in _SUFFIX_CATEGORIES})
+
+# Process-wide known-word sets per language, shared by all sessions and rebuilt
+# when the vocabulary generation in the deck index changes
+_known_words_cache: Dict[str, Tuple[int, FrozenSet[str], int]] = {}
+_known_words_lock = threading.Lock()
+_known_words_stats = {"hits": 0, "builds": 0}
+
+# Seconds between checks of the storage directory by the deck watcher (polling
+# interval, or how long filesystem events are batched with watchdog)
+DECK_WATCH_INTERVAL = float(os.environ.get("DECK_WATCH_INTERVAL", "2"))
+
+_deck_watcher = None
+_deck_watcher_lock = threading.Lock()
+
+# Number of parsed JSON files kept in memory, keyed by (path, mtime, size)
+JSON_CACHE_SIZE = 64
+
+_json_cache: "OrderedDict[Tuple[str, int, int], Tuple[bool, Any]]" = OrderedDict()
+_json_cache_lock = threading.Lock()
+_json_cache_stats = {"hits": 0, "misses": 0}
+
 def ensure_storage_dir():
     """Ensure the deck storage directory exists."""
     if not os.path.exists(DECK_STORAGE_DIR):
-        os.makedirs(DECK_STORAGE_DIR)
+        os.makedirs(DECK_STORAGE_DIR, exist_ok=True)
+
+@contextmanager
+def atomic_output(path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> Iterator[Any]:
+    """
+    Open a temporary file next to path and move it into place once fully written,
+    so readers (including other worker processes) never see a partial file.
+    
+    Args:
+        path: Final path of the file
+        mode: File mode, 'w' or 'wb'
+        encoding: Text encoding (ignored for binary mode)
+        
+    Yields:
+        Open file object to write to
+    """
+    # The dot prefix keeps the temp file from looking like a stored deck
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write a JSON file atomically.
+    
+    Args:
+        path: Path of the JSON file
+        data: Value to serialize
+    """
+    with atomic_output(path) as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def copy_file_atomic(source_path: str, dest_path: str) -> None:
+    """
+    Copy a file (with its metadata) so the destination appears all at once.
+    
+    Args:
+        source_path: File to copy
+        dest_path: Destination path
+    """
+    with atomic_output(dest_path, 'wb') as f, open(source_path, 'rb') as source:
+        shutil.copyfileobj(source, f)
+    shutil.copystat(source_path, dest_path)
+
+@contextmanager
+def open_apkg_collection(deck_path: str) -> Iterator[Optional[sqlite3.Connection]]:
+    """
+    Open the collection database of an Anki deck without extracting the archive.
+    
+    Only the collection entry is read; media files are skipped entirely. Small
+    collections are deserialized into an in-memory database, larger ones are
+    streamed to a temporary file that is removed afterwards.
+    
+    Args:
+        deck_path: Path to the Anki deck file
+        
+    Returns:
+        Context manager yielding an SQLite connection, or None if no readable collection was found
+    """
+    conn = None
+    temp_path = None
+    try:
+        with zipfile.ZipFile(deck_path, 'r') as zip_ref:
+            names = set(zip_ref.namelist())
+            entry = None
+            for candidate in APKG_COLLECTION_ENTRIES:
+                if candidate not in names:
+                    continue
+                if candidate.endswith('.anki21b') and zstandard is None:
+                    print(f"DEBUG: Skipping {candidate} in {deck_path}: install zstandard to read it")
+                    continue
+                entry = candidate
+                break
+            
+            if entry is None:
+                print(f"DEBUG: No collection database found in {deck_path}, entries: {sorted(names)[:10]}")
+            else:
+                with zip_ref.open(entry) as raw_stream:
+                    stream = raw_stream
+                    if entry.endswith('.anki21b'):
+                        stream = zstandard.ZstdDecompressor().stream_reader(raw_stream)
+                    
+                    # Read one byte past the limit to find out whether the collection fits in memory
+                    data = stream.read(MAX_IN_MEMORY_COLLECTION_BYTES + 1)
+                    if len(data) <= MAX_IN_MEMORY_COLLECTION_BYTES and hasattr(sqlite3.Connection, 'deserialize'):
+                        conn = sqlite3.connect(':memory:')
+                        conn.deserialize(data)
+                    else:
+                        fd, temp_path = tempfile.mkstemp(suffix='.sqlite3')
+                        with os.fdopen(fd, 'wb') as temp_file:
+                            temp_file.write(data)
+                            shutil.copyfileobj(stream, temp_file)
+                        conn = sqlite3.connect(temp_path)
+                    del data
+                print(f"DEBUG: Opened {entry} from {deck_path}")
+    except Exception as e:
+        print(f"ERROR extracting words from deck: {str(e)}")
+    
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
+        if temp_path is not None:
+            os.remove(temp_path)
 
 def extract_words_from_apkg(deck_path: str) -> Dict[str, List[str]]:
     """
@@ -23,10 +216,6 @@ def extract_words_from_apkg(deck_path: str) -> Dict[str, List[str]]:
     Returns:
         Dictionary of categorized words
     """
-    import sqlite3
-    import zipfile
-    import tempfile
-    
     print(f"DEBUG: Opening deck file: {deck_path}")
     
     # Initialize empty word dictionary
@@ -38,33 +227,24 @@ def extract_words_from_apkg(deck_path: str) -> Dict[str, List[str]]:
         "other": []
     }
     
-    # Create a temporary directory to extract the apkg
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Open only the collection database; media files are never extracted
+    with open_apkg_collection(deck_path) as conn:
         try:
-            # Extract the apkg (it's just a zip file)
-            with zipfile.ZipFile(deck_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-                print(f"DEBUG: Successfully extracted deck to {temp_dir}")
-            
-            # Connect to the extracted database
-            db_path = os.path.join(temp_dir, 'collection.anki2')
-            if not os.path.exists(db_path):
-                print(f"DEBUG: Database file not found at {db_path}")
-                print(f"DEBUG: Directory contents: {os.listdir(temp_dir)}")
+            if conn is None:
                 return words_dict
-                
-            conn = sqlite3.connect(db_path)
+            
             cursor = conn.cursor()
             
             # Try multiple approaches to extract words
             
             # Approach 1: Get model configurations to understand field structure
+            # (newer collections keep note types in their own table and leave this empty)
+            field_names = []
             try:
                 cursor.execute("SELECT models FROM col")
                 model_data = cursor.fetchone()
                 if model_data and model_data[0]:
                     # Parse the model data (it's stored as JSON)
-                    import json
                     try:
                         models = json.loads(model_data[0])
                         print(f"DEBUG: Successfully parsed model data, found {len(models)} models")
@@ -85,106 +265,53 @@ def extract_words_from_apkg(deck_path: str) -> Dict[str, List[str]]:
                 print(f"DEBUG: Error getting model data: {str(e)}")
                 field_names = []
             
-            # Approach 2: Get all notes (which contain the actual card content)
+            # Approach 2: Stream the notes once, in batches, deduplicating as we go
             try:
                 cursor.execute("""
-                    SELECT id, flds, sfld FROM notes 
+                    SELECT flds, sfld FROM notes 
                     WHERE flds IS NOT NULL AND length(trim(flds)) > 0
                 """)
-                notes = cursor.fetchall()
-                print(f"DEBUG: Found {len(notes)} notes")
-                
-                # Process each note
-                for note in notes:
-                    note_id, flds, sfld = note
+                seen_words = set()
+                note_count = 0
+                while True:
+                    notes = cursor.fetchmany(APKG_NOTE_BATCH_SIZE)
+                    if not notes:
+                        break
+                    note_count += len(notes)
                     
-                    # Try to extract words from the sorted field (sfld) first
-                    # This is usually the front of the card and often contains the word
-                    if sfld:
-                        words = [sfld.strip()]
-                    else:
-                        # Otherwise, split all fields and try to find the word
-                        fields = flds.split('\x1f')
-                        
-                        # If we identified likely word fields from the model, use those
-                        if field_names:
-                            words = [fields[i] for i in field_names if i < len(fields)]
+                    for flds, sfld in notes:
+                        # Try to extract words from the sorted field (sfld) first
+                        # This is usually the front of the card and often contains the word
+                        if sfld:
+                            words = [str(sfld)]
                         else:
-                            # Otherwise, use the first field as the word (common convention)
-                            words = [fields[0]] if fields else []
-                    
-                    # Process each potential word
-                    for word in words:
-                        # Clean the word
-                        word = re.sub('<[^<]+?>', '', word).strip()
-                        
-                        # Skip empty words or non-word characters
-                        if not word or not any(c.isalnum() for c in word):
-                            continue
-                        
-                        # Skip long strings that are likely sentences
-                        if len(word.split()) > 3:
-                            continue
-                        
-                        # Try to determine the category
-                        category = categorize_word(word)
+                            # Otherwise, split all fields and try to find the word
+                            fields = flds.split('\x1f')
+                            
+                            # Use the first field as the word (common convention), plus any
+                            # likely word fields identified from the model
+                            words = [fields[0]] + [fields[i] for i in field_names if 0 < i < len(fields)]
                         
-                        # Add the word to the appropriate category if not already present
-                        if word not in words_dict[category]:
-                            words_dict[category].append(word)
+                        # Process each potential word
+                        for word in words:
+                            # Clean the word
+                            if '<' in word:
+                                word = HTML_TAG_PATTERN.sub('', word)
+                            word = word.strip()
+                            
+                            # Skip empty words, duplicates and non-word characters
+                            if not word or word in seen_words or not any(c.isalnum() for c in word):
+                                continue
+                            
+                            # Skip long strings that are likely sentences
+                            if len(word.split()) > 3:
+                                continue
                             
-                            # Also try to get the translation from other fields
-                            # This could help with categorization
-                            if flds and len(fields) > 1:
-                                for field in fields[1:]:
-                                    # Skip empty fields or HTML-only fields
-                                    clean_field = re.sub('<[^<]+?>', '', field).strip()
-                                    if not clean_field:
-                                        continue
-                                    
-                                    # If this looks like a translation, use it to help categorize
-                                    if len(clean_field.split()) <= 3:
-                                        # This could be a translation, use it for additional categorization
-                                        pass
+                            seen_words.add(word)
+                            words_dict[categorize_word(word)].append(word)
+                print(f"DEBUG: Found {note_count} notes")
             except Exception as e:
                 print(f"DEBUG: Error processing notes: {str(e)}")
-            
-            # Approach 3: Try to get cards directly
-            try:
-                cursor.execute("""
-                    SELECT c.id, n.flds, n.sfld
-                    FROM cards c
-                    JOIN notes n ON c.nid = n.id
-                    WHERE n.flds IS NOT NULL AND length(trim(n.flds)) > 0
-                """)
-                cards = cursor.fetchall()
-                print(f"DEBUG: Found {len(cards)} cards")
-                
-                # Process cards similar to notes
-                for card in cards:
-                    card_id, flds, sfld = card
-                    
-                    # Process similar to notes approach
-                    if sfld:
-                        words = [sfld.strip()]
-                    else:
-                        fields = flds.split('\x1f')
-                        words = [fields[0]] if fields else []
-                    
-                    for word in words:
-                        # Clean and process as before
-                        word = re.sub('<[^<]+?>', '', word).strip()
-                        if not word or not any(c.isalnum() for c in word) or len(word.split()) > 3:
-                            continue
-                        
-                        category = categorize_word(word)
-                        if word not in words_dict[category]:
-                            words_dict[category].append(word)
-            except Exception as e:
-                print(f"DEBUG: Error processing cards: {str(e)}")
-            
-            # Close the connection
-            conn.close()
         
         except Exception as e:
             print(f"ERROR extracting words from deck: {str(e)}")
@@ -202,25 +329,19 @@ def categorize_word(word: str) -> str:
     Returns:
         Category name (nouns, verbs, adjectives, adverbs, other)
     """
-    # Default to "other" if we can't categorize
-    category = "other"
-    
-    # Verb patterns in Spanish
-    if any(word.endswith(suffix) for suffix in ['ar', 'er', 'ir', 'arse', 'erse', 'irse']):
-        category = "verbs"
-    # Adverb patterns
-    elif word.endswith('mente'):
-        category = "adverbs"
-    # Adjective patterns
-    elif any(word.endswith(suffix) for suffix in ['o', 'a', 'os', 'as', 'oso', 'osa', 'ble']):
-        category = "adjectives"
-    # Common noun endings
-    elif any(word.endswith(suffix) for suffix in ['ción', 'sión', 'dad', 'tad', 'eza']):
-        category = "nouns"
-    elif word[0].isupper():
-        category = "nouns"
-    
-    return category
+    # Find the highest-priority suffix rule the word matches (see SUFFIX_CATEGORY_RULES)
+    best = None
+    for length in _SUFFIX_LENGTHS:
+        match = _SUFFIX_CATEGORIES.get(word[-length:]) if len(word) >= length else None
+        if match is not None and (best is None or match[0] < best[0]):
+            best = match
+    if best is not None:
+        return best[1]
+    
+    # Capitalized words are likely nouns; default to "other" if we can't categorize
+    if word[:1].isupper():
+        return "nouns"
+    return "other"
 
 def save_deck_to_storage(deck_path: str, deck_name: Optional[str] = None, language: str = "Spanish") -> str:
     """
@@ -232,46 +353,498 @@ def save_deck_to_storage(deck_path: str, deck_name: Optional[str] = None, langua
         language: Language of the deck (default: Spanish)
         
     Returns:
-        Path to the stored deck
+        Path to the stored deck, or to the already stored deck with identical content
     """
     ensure_storage_dir()
     
+    # Identical content already stored for this language is reused instead of duplicated
+    content_hash = get_file_hash(deck_path)
+    existing_path = _find_stored_content(content_hash, language)
+    if existing_path:
+        return existing_path
+    
     # If no custom name provided, use the original filename
     if deck_name is None:
         deck_name = os.path.basename(deck_path)
     
-    # Create a unique filename to avoid overwrites
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    base_name, ext = os.path.splitext(deck_name)
+    # Extract words from the deck before taking the storage lock
+    words_dict = None
+    if deck_path.endswith('.apkg'):
+        try:
+            words_dict = extract_words_from_apkg(deck_path)
+        except Exception as e:
+            print(f"Warning: Could not extract words from deck: {str(e)}")
     
-    # Make sure the language is included in the filename
-    if language.lower() not in base_name.lower():
-        base_name = f"{base_name}_{language}"
+    with index_lock(DECK_STORAGE_DIR):
+        # Another worker may have stored the same deck while we were extracting
+        existing_path = _find_stored_content(content_hash, language)
+        if existing_path:
+            return existing_path
+        
+        # Create a unique filename to avoid overwrites
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        base_name, ext = os.path.splitext(deck_name)
+        if not ext and deck_path.endswith('.apkg'):
+            # Names like "New_Spanish_Words" keep the .apkg extension, otherwise the stored
+            # deck would read as a JSON word list and share its path with its companion JSON
+            ext = '.apkg'
+        
+        # Make sure the language is included in the filename
+        if language.lower() not in base_name.lower():
+            base_name = f"{base_name}_{language}"
+        
+        new_name = f"{base_name}_{timestamp}{ext}"
+        counter = 1
+        while os.path.exists(os.path.join(DECK_STORAGE_DIR, new_name)):
+            counter += 1
+            new_name = f"{base_name}_{timestamp}_{counter}{ext}"
+        
+        # New path in storage dir
+        new_path = os.path.join(DECK_STORAGE_DIR, new_name)
+        
+        # Create the companion JSON first, so the deck never appears without it
+        new_json_path = get_companion_json_path(new_path)
+        if deck_path.endswith('.apkg') and new_json_path != new_path:
+            if words_dict is not None:
+                write_json_atomic(new_json_path, words_dict)
+            else:
+                # If extraction failed, copy existing JSON if available
+                json_path = get_companion_json_path(deck_path)
+                if json_path != deck_path and os.path.exists(json_path):
+                    copy_file_atomic(json_path, new_json_path)
+        
+        # Store the deck file as a blob and link it under its new name
+        link_deck_blob(deck_path, new_path, content_hash)
+        
+        # Add the deck to the manifest and its words to the vocabulary index
+        refresh_stored_decks([new_name])
     
-    new_name = f"{base_name}_{timestamp}{ext}"
+    return new_path
+
+def _find_stored_content(content_hash: str, language: str) -> Optional[str]:
+    """
+    Find a stored deck of a language with the given content.
     
-    # New path in storage dir
-    new_path = os.path.join(DECK_STORAGE_DIR, new_name)
+    Args:
+        content_hash: SHA-256 digest of the deck file
+        language: Language of the deck
+        
+    Returns:
+        Path to the stored deck, or None if there is none
+    """
+    for deck in get_stored_decks(language):
+        if deck['content_hash'] == content_hash and os.path.exists(deck['path']):
+            print(f"DEBUG: Deck content already stored as {deck['path']}")
+            return deck['path']
+    return None
+
+def get_blob_dir() -> str:
+    """
+    Get the directory holding the content-addressed deck blobs.
     
-    # Copy the deck file
-    shutil.copy2(deck_path, new_path)
+    Returns:
+        Path to the blob directory
+    """
+    return os.path.join(DECK_STORAGE_DIR, BLOB_DIR_NAME)
+
+def link_deck_blob(source_path: str, dest_path: str, content_hash: str) -> None:
+    """
+    Store a file as a content-addressed blob and hard link it to its destination.
     
-    # Extract words from the deck and create companion JSON
-    if deck_path.endswith('.apkg'):
+    Where hard links are not supported the destination gets a plain copy and no
+    blob is kept, since it would only duplicate the copy.
+    
+    Args:
+        source_path: File to store
+        dest_path: Named path in the storage directory
+        content_hash: SHA-256 digest of the file
+    """
+    blob_dir = get_blob_dir()
+    os.makedirs(blob_dir, exist_ok=True)
+    blob_path = os.path.join(blob_dir, content_hash)
+    
+    created_blob = False
+    if not os.path.exists(blob_path):
+        copy_file_atomic(source_path, blob_path)
+        created_blob = True
+    
+    try:
+        os.link(blob_path, dest_path)
+    except OSError:
+        copy_file_atomic(blob_path, dest_path)
+        if created_blob:
+            os.remove(blob_path)
+
+def collect_garbage_blobs() -> Dict[str, int]:
+    """
+    Remove blobs that no stored deck is linked to any more.
+    
+    Returns:
+        Dictionary with the number of removed blobs and the bytes reclaimed
+    """
+    blob_dir = get_blob_dir()
+    result = {"removed": 0, "bytes": 0}
+    if not os.path.isdir(blob_dir):
+        return result
+    
+    with index_lock(DECK_STORAGE_DIR):
+        _collect_garbage_blobs(blob_dir, result)
+    
+    if result["removed"]:
+        print(f"DEBUG: Removed {result['removed']} unreferenced blobs ({result['bytes']} bytes)")
+    return result
+
+def _collect_garbage_blobs(blob_dir: str, result: Dict[str, int]) -> None:
+    """
+    Remove blobs without hard links from the storage directory; the caller holds
+    the storage lock, so no save can be between creating a blob and linking it.
+    
+    A stored deck with the same content that is a plain copy (e.g. a deck copied
+    in by hand) doesn't keep a blob alive, and blobs left behind by interrupted
+    saves are removed too.
+    
+    Args:
+        blob_dir: Blob directory
+        result: Counters of removed blobs and reclaimed bytes, updated in place
+    """
+    for blob_name in os.listdir(blob_dir):
+        blob_path = os.path.join(blob_dir, blob_name)
         try:
-            words_dict = extract_words_from_apkg(deck_path)
-            new_json_path = new_path.replace('.apkg', '.json')
-            with open(new_json_path, 'w', encoding='utf-8') as f:
-                json.dump(words_dict, f, ensure_ascii=False, indent=2)
+            stat = os.stat(blob_path)
+            if stat.st_nlink > 1:
+                continue
+            size = stat.st_size
+            os.remove(blob_path)
+        except OSError as e:
+            print(f"Warning: Could not remove blob {blob_name}: {str(e)}")
+            continue
+        result["removed"] += 1
+        result["bytes"] += size
+
+def get_companion_json_path(deck_path: str) -> str:
+    """
+    Get the path of the JSON word list belonging to a stored deck.
+    
+    Args:
+        deck_path: Path to the stored deck (.apkg file or JSON file without extension)
+        
+    Returns:
+        Path to the deck's word list
+    """
+    # Files without extension are already JSON files
+    if '.' not in os.path.basename(deck_path):
+        return deck_path
+    return deck_path.replace('.apkg', '.json')
+
+def _parse_json_bytes(data: bytes) -> Tuple[bool, Any]:
+    """
+    Parse JSON file contents, falling back to latin-1 when they are not valid UTF-8.
+    
+    Args:
+        data: Raw file contents
+        
+    Returns:
+        Tuple of (whether the contents are valid JSON, parsed value or None)
+    """
+    # Reject common binary file signatures (.apkg/zip, gzip) without parsing
+    if data.startswith(b'PK') or data.startswith(b'\x1F\x8B'):
+        return False, None
+    
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        # Try with latin-1 encoding
+        text = data.decode('latin-1')
+    
+    try:
+        if orjson is not None:
+            return True, orjson.loads(text)
+        return True, json.loads(text)
+    except ValueError:
+        # orjson.JSONDecodeError and json.JSONDecodeError are both ValueErrors
+        return False, None
+
+def _load_json_file(file_path: str) -> Tuple[bool, Any]:
+    """
+    Validate and parse a JSON file in a single read, memoized by (path, mtime, size).
+    
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Tuple of (whether the file is valid JSON, parsed value or None)
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False, None
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    
+    with _json_cache_lock:
+        if key in _json_cache:
+            _json_cache.move_to_end(key)
+            _json_cache_stats["hits"] += 1
+            return _json_cache[key]
+        _json_cache_stats["misses"] += 1
+    
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return False, None
+    result = _parse_json_bytes(data)
+    
+    with _json_cache_lock:
+        _json_cache[key] = result
+        _json_cache.move_to_end(key)
+        while len(_json_cache) > JSON_CACHE_SIZE:
+            _json_cache.popitem(last=False)
+    return result
+
+def load_json_file(file_path: str) -> Optional[Any]:
+    """
+    Load a JSON file, reusing the parsed value while the file is unchanged.
+    
+    The returned value is shared with other callers and must not be modified.
+    
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON value, or None if the file is missing or not valid JSON
+    """
+    return _load_json_file(file_path)[1]
+
+def get_json_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss counters of the parsed JSON cache.
+    
+    Returns:
+        Dictionary with hits, misses and the number of cached files
+    """
+    with _json_cache_lock:
+        return dict(_json_cache_stats, entries=len(_json_cache))
+
+def read_deck_words(json_path: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Read a deck's categorized words from its JSON word list.
+    
+    Args:
+        json_path: Path to the JSON word list
+        
+    Returns:
+        Dictionary of categorized words, or None if the file is missing or invalid
+    """
+    words_dict = load_json_file(json_path)
+    if not isinstance(words_dict, dict):
+        return None
+    # Copy the category lists so callers can modify them without touching the cache
+    return {category: list(words) for category, words in words_dict.items()}
+
+def get_file_hash(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def is_stored_deck_filename(filename: str) -> bool:
+    """
+    Check whether a file in the storage directory can be a deck: an .apkg file or
+    a JSON word list without extension (companion .json files are not decks).
+    
+    Args:
+        filename: Name of the file in the storage directory
+        
+    Returns:
+        True if the file is a deck candidate, False otherwise
+    """
+    return filename.endswith('.apkg') or '.' not in filename
+
+def _scan_stored_deck(filename: str) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, List[str]]]]]:
+    """
+    Read a stored deck's metadata and words.
+    
+    Args:
+        filename: Name of the deck file in the storage directory
+        
+    Returns:
+        Tuple of (manifest entry, categorized words or None), or None if the file is not a valid deck
+    """
+    path = os.path.join(DECK_STORAGE_DIR, filename)
+    if not is_stored_deck_filename(filename) or not os.path.isfile(path):
+        return None
+    
+    # Files without extension must be valid JSON word lists
+    if '.' not in filename and not is_valid_json_file(path):
+        return None
+    
+    stat = os.stat(path)
+    # Stat the word list before reading it, so a concurrent rewrite shows up as a change
+    json_size, json_mtime_ns = _get_companion_json_stat(path)
+    words_dict = read_deck_words(get_companion_json_path(path))
+    
+    # Extract timestamp from filename for sorting
+    timestamp_match = re.search(r'_(\d{8})_(\d{6})', filename)
+    timestamp = f"{timestamp_match.group(1)}_{timestamp_match.group(2)}" if timestamp_match else '00000000_000000'
+    
+    entry = {
+        'filename': filename,
+        'name': extract_display_name(filename),
+        'language': extract_language_from_filename(filename),
+        'timestamp': timestamp,
+        'word_count': sum(len(words) for words in words_dict.values()) if words_dict else 0,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'content_hash': get_file_hash(path),
+        'json_size': json_size,
+        'json_mtime_ns': json_mtime_ns
+    }
+    return entry, words_dict
+
+def _get_companion_json_stat(deck_path: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Get the size and mtime of a stored deck's JSON word list.
+    
+    Args:
+        deck_path: Path to the stored deck
+        
+    Returns:
+        Tuple of (size, mtime_ns), or (None, None) if the word list doesn't exist
+    """
+    try:
+        stat = os.stat(get_companion_json_path(deck_path))
+    except OSError:
+        return None, None
+    return stat.st_size, stat.st_mtime_ns
+
+def refresh_stored_decks(filenames: List[str]) -> None:
+    """
+    Re-read specific stored decks into the manifest and vocabulary index,
+    dropping the ones that no longer exist.
+    
+    Args:
+        filenames: Names of deck files in the storage directory
+    """
+    with index_lock(DECK_STORAGE_DIR), index_connection(DECK_STORAGE_DIR) as conn:
+        _refresh_stored_decks(filenames, conn)
+
+def _refresh_stored_decks(filenames: List[str], conn: sqlite3.Connection) -> None:
+    """
+    Re-read stored decks into the manifest and vocabulary index; the caller holds the storage lock.
+    
+    Args:
+        filenames: Names of deck files in the storage directory
+        conn: Open connection to the deck index
+    """
+    entries = []
+    removed = []
+    for filename in filenames:
+        try:
+            scanned = _scan_stored_deck(filename)
         except Exception as e:
-            print(f"Warning: Could not extract words from deck: {str(e)}")
-            # If extraction fails, copy existing JSON if available
-            json_path = deck_path.replace('.apkg', '.json')
-            if os.path.exists(json_path):
-                new_json_path = new_path.replace('.apkg', '.json')
-                shutil.copy2(json_path, new_json_path)
+            print(f"Warning: Could not read stored deck {filename}: {str(e)}")
+            scanned = None
+        
+        if scanned is None:
+            removed.append(filename)
+            continue
+        
+        entry, words_dict = scanned
+        entries.append(entry)
+        index_deck_words(DECK_STORAGE_DIR, filename, entry['language'], words_dict, conn=conn)
     
-    return new_path
+    if removed:
+        remove_deck_words(DECK_STORAGE_DIR, removed, conn=conn)
+    update_manifest(DECK_STORAGE_DIR, entries=entries, removed=removed, conn=conn)
+
+def rescan_stored_decks(force: bool = False) -> None:
+    """
+    Bring the manifest and vocabulary index in line with the storage directory.
+    
+    Only files that are new, changed (size or mtime of the deck or its JSON
+    word list) or gone are re-read; the directory mtime seen before listing is
+    recorded so unchanged directories can skip the scan entirely. Files are
+    compared without the storage lock, which is only taken when there is
+    something to update, so idle polling doesn't contend with saves.
+    
+    Args:
+        force: Compare every file even if the directory mtime is unchanged
+            (needed to catch decks or word lists modified in place)
+    """
+    ensure_storage_dir()
+    with index_connection(DECK_STORAGE_DIR) as conn:
+        storage_mtime_ns = os.stat(DECK_STORAGE_DIR).st_mtime_ns
+        if get_manifest_storage_mtime(DECK_STORAGE_DIR, conn) == storage_mtime_ns:
+            if not force:
+                return
+            changed, removed = _find_stale_decks(conn)
+            if not changed and not removed:
+                return
+        
+        with index_lock(DECK_STORAGE_DIR):
+            storage_mtime_ns = os.stat(DECK_STORAGE_DIR).st_mtime_ns
+            if not force and get_manifest_storage_mtime(DECK_STORAGE_DIR, conn) == storage_mtime_ns:
+                # Another worker rescanned while we were waiting for the lock
+                return
+            _rescan_stored_decks(storage_mtime_ns, conn)
+
+def _find_stale_decks(conn: sqlite3.Connection) -> Tuple[List[str], List[str]]:
+    """
+    Compare the storage directory with the manifest.
+    
+    Args:
+        conn: Open connection to the deck index
+        
+    Returns:
+        Tuple of (names of new or changed decks, names of manifest entries whose file is gone)
+    """
+    known_entries = {entry['filename']: entry for entry in get_manifest_entries(DECK_STORAGE_DIR, conn)}
+    changed = []
+    present = set()
+    for filename in os.listdir(DECK_STORAGE_DIR):
+        if not is_stored_deck_filename(filename):
+            continue
+        present.add(filename)
+        entry = known_entries.get(filename)
+        path = os.path.join(DECK_STORAGE_DIR, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if (entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns
+                or (entry['json_size'], entry['json_mtime_ns']) != _get_companion_json_stat(path)):
+            changed.append(filename)
+    
+    removed = [filename for filename in known_entries if filename not in present]
+    return changed, removed
+
+def _rescan_stored_decks(storage_mtime_ns: int, conn: sqlite3.Connection) -> None:
+    """
+    Re-read new, changed and removed decks; the caller holds the storage lock.
+    
+    Args:
+        storage_mtime_ns: Storage directory mtime taken before listing it
+        conn: Open connection to the deck index
+    """
+    changed, removed = _find_stale_decks(conn)
+    if changed or removed:
+        _refresh_stored_decks(changed + removed, conn)
+    if get_manifest_storage_mtime(DECK_STORAGE_DIR, conn) != storage_mtime_ns:
+        update_manifest(DECK_STORAGE_DIR, storage_mtime_ns=storage_mtime_ns, conn=conn)
+    
+    # Decks deleted by hand may have been the last links to their blobs
+    if removed:
+        collect_garbage_blobs()
 
 def extract_language_from_filename(filename: str) -> str:
     """
@@ -331,61 +904,50 @@ def extract_display_name(filename: str) -> str:
     
     return name
 
-def get_stored_decks(language_filter: Optional[str] = None) -> List[Dict[str, str]]:
+def _ensure_manifest_current(conn: sqlite3.Connection) -> None:
+    """
+    Rescan the storage directory if it changed since the manifest was last built.
+    
+    Args:
+        conn: Open connection to the deck index
+    """
+    ensure_storage_dir()
+    if get_manifest_storage_mtime(DECK_STORAGE_DIR, conn) != os.stat(DECK_STORAGE_DIR).st_mtime_ns:
+        rescan_stored_decks()
+
+def get_stored_decks(language_filter: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get a list of all stored Anki decks.
     
+    Deck metadata comes from the manifest, which is only rescanned when the
+    storage directory's mtime differs from the one recorded at the last scan.
+    
     Args:
         language_filter: Optional language to filter decks by
         
     Returns:
         List of dictionaries containing deck info
     """
-    ensure_storage_dir()
-    
-    print(f"DEBUG: get_stored_decks called with language_filter: {language_filter}")
-    print(f"DEBUG: Looking for decks in directory: {DECK_STORAGE_DIR}")
+    with index_connection(DECK_STORAGE_DIR) as conn:
+        _ensure_manifest_current(conn)
+        entries = get_manifest_entries(DECK_STORAGE_DIR, conn)
     
     decks = []
-    for filename in os.listdir(DECK_STORAGE_DIR):
-        filepath = os.path.join(DECK_STORAGE_DIR, filename)
-        print(f"DEBUG: Checking file: {filename}, full path: {filepath}")
+    for entry in entries:
+        # Apply language filter if specified
+        if language_filter and entry['language'].lower() != language_filter.lower():
+            continue
         
-        # Include both .apkg files and files without extension (which are valid JSON files)
-        if filename.endswith('.apkg') or (os.path.isfile(filepath) and '.' not in filename):
-            path = filepath
-            
-            # For files without extension, check if they're valid JSON
-            if '.' not in filename:
-                print(f"DEBUG: File without extension found: {filename}")
-                if not is_valid_json_file(path):
-                    print(f"DEBUG: File is not a valid JSON file, skipping: {filename}")
-                    continue
-                else:
-                    print(f"DEBUG: Valid JSON file without extension: {filename}")
-            
-            # Extract language from filename
-            language = extract_language_from_filename(filename)
-            print(f"DEBUG: Extracted language: {language} for file: {filename}")
-            
-            # Apply language filter if specified
-            if language_filter and language.lower() != language_filter.lower():
-                continue
-            
-            # Extract timestamp from filename for sorting
-            timestamp_match = re.search(r'_(\d{8})_(\d{6})', filename)
-            timestamp = f"{timestamp_match.group(1)}_{timestamp_match.group(2)}" if timestamp_match else '00000000_000000'
-            
-            # Create a friendly display name
-            display_name = extract_display_name(filename)
-            
-            decks.append({
-                'name': display_name,
-                'original_filename': filename,
-                'path': path,
-                'timestamp': timestamp,
-                'language': language
-            })
+        decks.append({
+            'name': entry['name'],
+            'original_filename': entry['filename'],
+            'path': os.path.join(DECK_STORAGE_DIR, entry['filename']),
+            'timestamp': entry['timestamp'],
+            'language': entry['language'],
+            'word_count': entry['word_count'],
+            'size': entry['size'],
+            'content_hash': entry['content_hash']
+        })
     
     # Sort by timestamp (newest first)
     decks.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -403,7 +965,9 @@ def delete_stored_deck(deck_path: str) -> bool:
         Success status
     """
     try:
-        if os.path.exists(deck_path):
+        with index_lock(DECK_STORAGE_DIR):
+            if not os.path.exists(deck_path):
+                return False
             os.remove(deck_path)
             
             # For .apkg files, also remove the companion JSON if it exists
@@ -412,8 +976,15 @@ def delete_stored_deck(deck_path: str) -> bool:
                 if os.path.exists(json_path):
                     os.remove(json_path)
             
+            # Drop the deck from the manifest and its words from the vocabulary index,
+            # then reclaim its blob if no other deck is linked to it
+            try:
+                refresh_stored_decks([os.path.basename(deck_path)])
+                collect_garbage_blobs()
+            except Exception as e:
+                print(f"Warning: Could not update deck index: {str(e)}")
+            
             return True
-        return False
     except Exception as e:
         print(f"Error deleting deck: {str(e)}")
         return False
@@ -422,93 +993,205 @@ def is_valid_json_file(file_path: str) -> bool:
     """
     Check if a file is a valid JSON file.
     
+    The parsed contents are memoized, so loading the file afterwards with
+    load_json_file or read_deck_words does not read it again.
+    
     Args:
         file_path: Path to the file to check
         
     Returns:
         True if the file is a valid JSON file, False otherwise
     """
-    try:
-        # Try to read the first few bytes to check if it's a binary file
-        with open(file_path, 'rb') as f:
-            header = f.read(8)
-            # Check for common binary file signatures
-            if header.startswith(b'PK') or header.startswith(b'\x1F\x8B'):
-                return False
-        
-        # Try to parse as JSON
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json.load(f)
-        return True
-    except UnicodeDecodeError:
-        # Try with latin-1 encoding
-        try:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                json.load(f)
-            return True
-        except:
-            return False
-    except:
-        return False
+    return _load_json_file(file_path)[0]
 
 def get_words_from_all_stored_decks(language: str = "Spanish") -> Set[str]:
     """
     Get all words from all stored decks of a specific language.
     
+    Words come from the persistent vocabulary index, which is kept up to date by
+    save_deck_to_storage and delete_stored_deck; decks added to the storage
+    directory by other means are indexed by the next manifest rescan.
+    
     Args:
         language: Language filter for the decks
         
     Returns:
         Set of all words
     """
-    all_words = set()
+    try:
+        with index_connection(DECK_STORAGE_DIR) as conn:
+            # Validate the manifest (and vocabulary index) against the directory first
+            _ensure_manifest_current(conn)
+            return get_language_words(DECK_STORAGE_DIR, language, conn)
+    except Exception as e:
+        print(f"Error reading vocabulary index: {str(e)}")
+        return set()
+
+def get_known_words(language: str = "Spanish") -> FrozenSet[str]:
+    """
+    Get the lowercase words of all stored decks of a language as a frozen set.
+    
+    The set is built once from the vocabulary index and shared across sessions
+    until decks of any language are saved, deleted or changed.
     
-    for deck_info in get_stored_decks(language_filter=language):
-        deck_path = deck_info['path']
+    Args:
+        language: Language of the decks
         
-        # Handle files without extension (which are already JSON files)
-        if '.' not in deck_path:
-            json_path = deck_path
-        else:
-            json_path = deck_path.replace('.apkg', '.json')
+    Returns:
+        Frozen set of lowercase words
+    """
+    try:
+        with index_connection(DECK_STORAGE_DIR) as conn:
+            # Validate the manifest (and vocabulary index) against the directory first
+            _ensure_manifest_current(conn)
+            generation = get_vocabulary_generation(DECK_STORAGE_DIR, conn)
+            
+            with _known_words_lock:
+                cached = _known_words_cache.get(language)
+                if cached is not None and cached[0] == generation:
+                    _known_words_stats["hits"] += 1
+                    return cached[1]
+                
+                known_words = frozenset(get_language_words(DECK_STORAGE_DIR, language, conn))
+                # Measure the set once here rather than on every stats call
+                known_words_bytes = sys.getsizeof(known_words) + sum(sys.getsizeof(word) for word in known_words)
+                _known_words_cache[language] = (generation, known_words, known_words_bytes)
+                _known_words_stats["builds"] += 1
+                return known_words
+    except Exception as e:
+        print(f"Error reading vocabulary index: {str(e)}")
+        return frozenset()
+
+def get_known_words_stats() -> Dict[str, Any]:
+    """
+    Get statistics about the process-wide known-word sets.
+    
+    Returns:
+        Dictionary with hit/build counters, the number of cached words and the
+        approximate memory used by the sets and their strings in bytes
+    """
+    with _known_words_lock:
+        entries = list(_known_words_cache.values())
+        stats = dict(_known_words_stats)
+    stats["languages"] = len(entries)
+    stats["words"] = sum(len(known_words) for _, known_words, _ in entries)
+    stats["bytes"] = sum(known_words_bytes for _, _, known_words_bytes in entries)
+    return stats
+
+class _DeckEventHandler(FileSystemEventHandler):
+    """Collects the names of deck files touched by filesystem events."""
+    
+    def __init__(self, watcher: "DeckStorageWatcher"):
+        super().__init__()
+        self.watcher = watcher
+    
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.mark_changed(os.path.basename(os.fsdecode(path)))
+
+class DeckStorageWatcher:
+    """
+    Keep the deck manifest and vocabulary index in step with out-of-band changes
+    to the storage directory, such as decks copied in by hand or saved by
+    another worker process.
+    
+    Uses watchdog (inotify and friends) when it is installed and otherwise polls
+    the directory; either way only the decks that changed are re-read.
+    """
+    
+    def __init__(self, interval: float = DECK_WATCH_INTERVAL):
+        """
+        Args:
+            interval: Seconds between polls, or between flushes of collected events
+        """
+        self.interval = interval
+        self.mode = "watchdog" if Observer is not None else "polling"
+        self._changed: Set[str] = set()
+        self._changed_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+    
+    def mark_changed(self, filename: str) -> None:
+        """
+        Record that a file in the storage directory changed.
+        
+        Args:
+            filename: Name of the changed file; companion .json files map to their deck
+        """
+        if filename.endswith('.json'):
+            filename = filename[:-len('.json')] + '.apkg'
+        if is_stored_deck_filename(filename):
+            with self._changed_lock:
+                self._changed.add(filename)
+    
+    def start(self) -> "DeckStorageWatcher":
+        """
+        Start watching in a background thread.
         
-        # Process the JSON file if it exists and is valid
-        if os.path.exists(json_path) and is_valid_json_file(json_path):
+        Returns:
+            The watcher itself
+        """
+        if self._thread is not None:
+            return self
+        ensure_storage_dir()
+        
+        if self.mode == "watchdog":
+            self._observer = Observer()
+            self._observer.schedule(_DeckEventHandler(self), DECK_STORAGE_DIR, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        
+        self._thread = threading.Thread(target=self._run, name="deck-storage-watcher", daemon=True)
+        self._thread.start()
+        print(f"DEBUG: Watching {DECK_STORAGE_DIR} for deck changes ({self.mode})")
+        return self
+    
+    def stop(self) -> None:
+        """Stop watching and wait for the background thread to finish."""
+        self._stop_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    deck_words = json.load(f)
-                    for category, words in deck_words.items():
-                        # Handle both simple lists and normalized adjective formats (word/wordFeminine)
-                        processed_words = []
-                        for word in words:
-                            if '/' in word:
-                                # Split and add both forms
-                                parts = word.split('/')
-                                processed_words.extend(parts)
-                            else:
-                                processed_words.append(word)
-                        
-                        all_words.update([w.lower() for w in processed_words])
-            except UnicodeDecodeError:
-                # Try with different encodings if utf-8 fails
-                try:
-                    with open(json_path, 'r', encoding='latin-1') as f:
-                        deck_words = json.load(f)
-                        for category, words in deck_words.items():
-                            # Handle both simple lists and normalized adjective formats (word/wordFeminine)
-                            processed_words = []
-                            for word in words:
-                                if '/' in word:
-                                    # Split and add both forms
-                                    parts = word.split('/')
-                                    processed_words.extend(parts)
-                                else:
-                                    processed_words.append(word)
-                            
-                            all_words.update([w.lower() for w in processed_words])
-                except Exception as e:
-                    print(f"Error reading words with latin-1 encoding from {json_path}: {str(e)}")
+                self.poll()
             except Exception as e:
-                print(f"Error reading words from {json_path}: {str(e)}")
+                print(f"Warning: Deck watcher could not refresh stored decks: {str(e)}")
+    
+    def poll(self) -> None:
+        """Apply the changes seen since the last call."""
+        if self.mode == "polling":
+            # Compares without the lock; re-reads only decks that differ from their manifest entry
+            rescan_stored_decks(force=True)
+            return
+        
+        with self._changed_lock:
+            changed, self._changed = self._changed, set()
+        if changed:
+            refresh_stored_decks(sorted(changed))
+
+def start_deck_watcher(interval: float = DECK_WATCH_INTERVAL) -> DeckStorageWatcher:
+    """
+    Start the process-wide deck storage watcher, or return it if already running.
     
-    return all_words
\ No newline at end of file
+    Args:
+        interval: Seconds between polls, or between flushes of collected events
+        
+    Returns:
+        The running watcher
+    """
+    global _deck_watcher
+    with _deck_watcher_lock:
+        if _deck_watcher is None:
+            _deck_watcher = DeckStorageWatcher(interval).start()
+        return _deck_watcher
@@ -1,27 +1,72 @@
 import os
 import tempfile
+import threading
 from google.cloud import texttospeech
-from typing import Optional, List, Dict
+from google.api_core import exceptions as google_exceptions
+from typing import Optional, List, Dict, Tuple
+from rate_limiter import RateLimited, get_rate_limiter
+
+# Process-wide client, reused until the credentials file changes
+_tts_client = None
+_tts_client_credentials = None
+_tts_client_lock = threading.Lock()
+
+def get_credentials_signature() -> Optional[Tuple[str, Optional[int]]]:
+    """
+    Identify the current Google Cloud credentials by file path and modification time.
+    
+    Returns:
+        Tuple of (credentials path, mtime in nanoseconds or None if unreadable),
+        or None if GOOGLE_APPLICATION_CREDENTIALS is not set
+    """
+    credentials_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if not credentials_path:
+        return None
+    try:
+        return credentials_path, os.stat(credentials_path).st_mtime_ns
+    except OSError:
+        return credentials_path, None
 
 def init_google_cloud_tts():
     """
-    Initialize Google Cloud Text-to-Speech client.
+    Get the Google Cloud Text-to-Speech client.
     Requires GOOGLE_APPLICATION_CREDENTIALS environment variable to be set.
     
+    The client is created once per process and reused; it is only recreated when
+    the credentials path or file changes. A failed initialization is remembered
+    for the same credentials, so it is not retried for every word.
+    
     Returns:
         Google Cloud TTS client or None if credentials not available
     """
-    try:
-        # Check if credentials are available
-        if not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
-            return None
-            
-        # Create the client
-        client = texttospeech.TextToSpeechClient()
-        return client
-    except Exception as e:
-        print(f"Error initializing Google Cloud TTS: {e}")
+    global _tts_client, _tts_client_credentials
+    
+    # Check if credentials are available
+    credentials = get_credentials_signature()
+    if credentials is None:
         return None
+    
+    with _tts_client_lock:
+        if credentials == _tts_client_credentials:
+            return _tts_client
+        
+        try:
+            # Create the client
+            client = texttospeech.TextToSpeechClient()
+        except Exception as e:
+            print(f"Error initializing Google Cloud TTS: {e}")
+            client = None
+        
+        _tts_client = client
+        _tts_client_credentials = credentials
+        return client
+
+def reset_google_cloud_tts() -> None:
+    """Drop the cached client, so the next call creates a new one."""
+    global _tts_client, _tts_client_credentials
+    with _tts_client_lock:
+        _tts_client = None
+        _tts_client_credentials = None
 
 def sanitize_filename(text: str) -> str:
     """
@@ -58,7 +103,7 @@ def generate_audio_gcloud(word: str, language: str = "es-ES", output_dir: Option
     Returns:
         Path to the generated audio file or None if generation failed
     """
-    # Initialize client
+    # Get the shared client
     client = init_google_cloud_tts()
     
     # If client initialization failed, return None
@@ -81,10 +126,16 @@ def generate_audio_gcloud(word: str, language: str = "es-ES", output_dir: Option
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        # Perform the text-to-speech request
-        response = client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
-        )
+        # Perform the text-to-speech request under the shared rate limit
+        def synthesize():
+            try:
+                return client.synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
+            except (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted) as e:
+                raise RateLimited(message=str(e))
+        
+        response = get_rate_limiter("gcloud_tts").call(synthesize)
         
         # Create a file to store the audio
         if output_dir:
@@ -138,6 +189,8 @@ def is_gcloud_tts_available() -> bool:
     """
     Check if Google Cloud TTS is available (credentials are set).
     
+    Uses the cached client, so after the first call this only stats the credentials file.
+    
     Returns:
         True if Google Cloud TTS is available, False otherwise
     """
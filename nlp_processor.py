@@ -1,9 +1,18 @@
 import nltk
+import os
 import re
-from typing import Dict, List, Set, Tuple, Optional
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple, Optional
+import numpy
 import spacy
 import spacy.cli
-from collections import defaultdict
+from spacy.attrs import POS, LEMMA, IS_STOP, IS_PUNCT, IS_SPACE, IDX, LENGTH
+from spacy.parts_of_speech import NAMES as POS_NAMES
+from collections import OrderedDict, defaultdict
 
 # Download required NLTK data
 try:
@@ -51,26 +60,193 @@ POS_TO_CATEGORY = {
     "X": "Other"
 }
 
-def load_language_model(language: str):
+# Pipeline components each extraction profile leaves out of the model.
+# Categorizing only needs POS tags (tagger/morphologizer + attribute_ruler) and the
+# lexical is_stop/is_punct flags; lemmas additionally need the lemmatizer, which uses
+# the POS tags. None of the functions here use the dependency parser or NER.
+EXTRACTION_PROFILES = {
+    "full": [],
+    "categorize": ["parser", "ner", "lemmatizer"],
+    "lemmas": ["parser", "ner"],
+}
+
+# Default chunk size (in characters) and batch size for chunked processing with nlp.pipe
+DEFAULT_CHUNK_CHARS = 100000
+DEFAULT_BATCH_SIZE = 4
+
+# Boundaries to cut chunks at, from most to least preferred
+CHUNK_SEPARATORS = ["\n\n", "\n", ". ", "? ", "! ", " "]
+
+# Directory for the on-disk cache of categorize_words results
+CATEGORIZE_CACHE_DIR = "nlp_cache"
+
+# Total size of the on-disk categorize_words cache before least recently used entries are evicted
+CATEGORIZE_CACHE_MAX_BYTES = int(os.environ.get("CATEGORIZE_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+# Number of categorize_words results kept in memory
+CATEGORIZE_CACHE_SIZE = 32
+
+# Version of the categorizing rules; bump it whenever categorize_words' output changes
+CATEGORIZE_CACHE_VERSION = 1
+
+_categorize_cache: "OrderedDict[str, Dict[str, List[str]]]" = OrderedDict()
+_categorize_cache_lock = threading.Lock()
+_categorize_cache_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+# Token attributes stored per token by AnalyzedText, in column order
+ANALYSIS_ATTRS = [POS, LEMMA, IS_STOP, IS_PUNCT, IS_SPACE, IDX, LENGTH]
+
+# Maximum number of languages whose models stay resident in the model cache.
+# Each small spaCy model costs tens of MB, so keep only the most recently used ones.
+MAX_CACHED_LANGUAGES = max(1, int(os.environ.get("NLP_MAX_CACHED_LANGUAGES", "2")))
+
+# Process-wide cache of loaded spaCy models, keyed by (model name, excluded components).
+# Ordered from least to most recently used so eviction can pop from the front.
+_model_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], Any]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+# One lock per cache key so concurrent callers never load the same model twice,
+# while different models can still load in parallel
+_model_load_locks: Dict[Tuple[str, Tuple[str, ...]], threading.Lock] = {}
+_model_cache_stats = {"hits": 0, "loads": 0, "evictions": 0, "load_seconds": 0.0}
+
+def _model_cache_key(language: str, exclude: Optional[List[str]] = None) -> Tuple[str, Tuple[str, ...]]:
     """
-    Load the appropriate spaCy language model.
+    Build the model cache key for a language and set of excluded pipeline components.
     
     Args:
         language: The language name
+        exclude: Optional list of pipeline components to leave out of the model
         
     Returns:
-        Loaded spaCy language model
+        Tuple of (model name, sorted excluded components)
     """
     model_name = LANGUAGE_TO_MODEL.get(language, "en_core_web_sm")
+    return model_name, tuple(sorted(set(exclude or [])))
+
+def _load_model_from_disk(model_name: str, exclude: Tuple[str, ...]):
+    """
+    Load a spaCy model, downloading it first if it is not installed.
     
+    Args:
+        model_name: Name of the spaCy model package
+        exclude: Pipeline components to leave out of the model
+        
+    Returns:
+        Loaded spaCy language model
+    """
     try:
         # Try to load the model
-        nlp = spacy.load(model_name)
-        return nlp
+        return spacy.load(model_name, exclude=list(exclude))
     except OSError:
         # If model not found, download it
         spacy.cli.download(model_name)
-        return spacy.load(model_name)
+        return spacy.load(model_name, exclude=list(exclude))
+
+def _evict_least_recent_models() -> None:
+    """
+    Evict the least recently used languages until at most MAX_CACHED_LANGUAGES remain.
+    The caller must hold _model_cache_lock.
+    """
+    # Model names ordered from most to least recently used
+    resident = list(dict.fromkeys(key[0] for key in reversed(_model_cache)))
+    for model_name in resident[MAX_CACHED_LANGUAGES:]:
+        for key in [key for key in _model_cache if key[0] == model_name]:
+            del _model_cache[key]
+            _model_cache_stats["evictions"] += 1
+        print(f"DEBUG: Evicted spaCy model {model_name} from the model cache")
+
+def load_language_model(language: str, exclude: Optional[List[str]] = None, profile: Optional[str] = None):
+    """
+    Load the appropriate spaCy language model.
+    
+    Models are cached process-wide, so repeated calls (across PDFs, Streamlit
+    reruns and sessions) reuse the already loaded pipeline.
+    
+    Args:
+        language: The language name
+        exclude: Optional list of pipeline components to leave out of the model
+        profile: Optional name of an EXTRACTION_PROFILES entry whose components to exclude
+        
+    Returns:
+        Loaded spaCy language model
+    """
+    if profile is not None:
+        exclude = list(exclude or []) + EXTRACTION_PROFILES[profile]
+    key = _model_cache_key(language, exclude)
+    
+    with _model_cache_lock:
+        nlp = _model_cache.get(key)
+        if nlp is not None:
+            _model_cache.move_to_end(key)
+            _model_cache_stats["hits"] += 1
+            return nlp
+        load_lock = _model_load_locks.setdefault(key, threading.Lock())
+    
+    with load_lock:
+        # Another thread may have finished loading the model while we waited
+        with _model_cache_lock:
+            nlp = _model_cache.get(key)
+            if nlp is not None:
+                _model_cache.move_to_end(key)
+                _model_cache_stats["hits"] += 1
+                return nlp
+        
+        start_time = time.perf_counter()
+        nlp = _load_model_from_disk(*key)
+        elapsed = time.perf_counter() - start_time
+        print(f"DEBUG: Loaded spaCy model {key[0]} (excluding {list(key[1])}) in {elapsed:.2f}s")
+        
+        with _model_cache_lock:
+            _model_cache[key] = nlp
+            _model_cache_stats["loads"] += 1
+            _model_cache_stats["load_seconds"] += elapsed
+            _evict_least_recent_models()
+    
+    return nlp
+
+def warmup_language_models(languages: List[str], exclude: Optional[List[str]] = None, profile: Optional[str] = None) -> Dict[str, float]:
+    """
+    Load models into the model cache ahead of time.
+    
+    Models that are already resident are skipped without counting as cache hits.
+    
+    Args:
+        languages: Language names to warm up
+        exclude: Optional list of pipeline components to leave out of the models
+        profile: Optional name of an EXTRACTION_PROFILES entry whose components to exclude
+        
+    Returns:
+        Dictionary mapping each language to the seconds spent loading it (0.0 if already cached)
+    """
+    if profile is not None:
+        exclude = list(exclude or []) + EXTRACTION_PROFILES[profile]
+    
+    timings = {}
+    for language in languages:
+        with _model_cache_lock:
+            is_resident = _model_cache_key(language, exclude) in _model_cache
+        if is_resident:
+            timings[language] = 0.0
+            continue
+        start_time = time.perf_counter()
+        load_language_model(language, exclude)
+        timings[language] = time.perf_counter() - start_time
+    return timings
+
+def get_model_cache_stats() -> Dict[str, Any]:
+    """
+    Get counters describing the model cache.
+    
+    Returns:
+        Dictionary with hits, loads, evictions, total load time and the resident models
+    """
+    with _model_cache_lock:
+        stats = dict(_model_cache_stats)
+        stats["resident"] = [
+            {"model": model_name, "exclude": list(exclude)}
+            for model_name, exclude in _model_cache
+        ]
+    return stats
 
 def normalize_adjectives(adjectives: Set[str], language: str) -> List[str]:
     """
@@ -192,17 +368,459 @@ def normalize_adjectives(adjectives: Set[str], language: str) -> List[str]:
     return sorted(normalized_adjs)
 
 
+def split_text_into_chunks(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Split text into consecutive chunks of at most max_chars characters.
+    
+    Chunks are cut at the last paragraph, line or sentence boundary in each window
+    (falling back to whitespace), and concatenating them gives back the original text.
+    
+    Args:
+        text: The text to split
+        max_chars: Maximum number of characters per chunk
+        
+    Returns:
+        List of text chunks in document order
+    """
+    chunks = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = end  # Hard cut if the window has no boundary at all
+        for separator in CHUNK_SEPARATORS:
+            position = text.rfind(separator, start, end)
+            if position > start:
+                cut = position + len(separator)
+                break
+        chunks.append(text[start:cut])
+        start = cut
+    if start < len(text):
+        chunks.append(text[start:])
+    return chunks
+
+class TokenInfo(NamedTuple):
+    """A single token of an AnalyzedText."""
+    text: str
+    pos: str
+    lemma: str
+    is_stop: bool
+    is_punct: bool
+    is_space: bool
+
+class AnalyzedText:
+    """
+    Result of running the spaCy pipeline over a document once.
+    
+    Holds a compact per-token array (POS id, lemma id, stop/punct/space flags and
+    character offsets, see ANALYSIS_ATTRS) instead of the spaCy Doc, so that
+    categorize_words, extract_lemmas, get_important_words and find_word_sentences
+    can all query the same analysis without reparsing the text.
+    """
+    
+    def __init__(self, text: str, language: str, token_array: numpy.ndarray, strings, profile: str = "full"):
+        """
+        Args:
+            text: The analyzed text
+            language: The language of the text
+            token_array: Array of shape (tokens, len(ANALYSIS_ATTRS)) from Doc.to_array
+            strings: The StringStore used to resolve lemma ids
+            profile: Name of the EXTRACTION_PROFILES entry the model was loaded with
+        """
+        self.text = text
+        self.language = language
+        self.token_array = token_array
+        self.strings = strings
+        self.profile = profile
+        self._sentences = None
+        self._sentence_index = None
+    
+    @property
+    def has_lemmas(self) -> bool:
+        """Whether the analysis was made with the lemmatizer (False for the "categorize" profile)."""
+        return "lemmatizer" not in EXTRACTION_PROFILES[self.profile]
+    
+    def __len__(self) -> int:
+        return len(self.token_array)
+    
+    def tokens(self) -> Iterator[TokenInfo]:
+        """
+        Iterate over the tokens in document order.
+        
+        Returns:
+            Iterator of TokenInfo tuples
+        """
+        text = self.text
+        strings = self.strings
+        for pos_id, lemma_id, is_stop, is_punct, is_space, start, length in self.token_array.tolist():
+            yield TokenInfo(
+                text[start:start + length],
+                POS_NAMES.get(pos_id, ""),
+                strings[lemma_id] if lemma_id else "",
+                bool(is_stop),
+                bool(is_punct),
+                bool(is_space)
+            )
+    
+    @property
+    def sentences(self) -> List[str]:
+        """Sentences of the text, split once on first use."""
+        if self._sentences is None:
+            from pdf_processor import extract_sentences
+            self._sentences = extract_sentences(self.text)
+        return self._sentences
+    
+    def find_word_sentences(self, words: List[str]) -> Dict[str, List[str]]:
+        """
+        Find sentences in the text that contain each word.
+        
+        Args:
+            words: List of words to find sentences for
+            
+        Returns:
+            Dictionary mapping each word to a list of sentences that contain it
+        """
+        from pdf_processor import build_sentence_index, find_word_sentences
+        if self._sentence_index is None:
+            self._sentence_index = build_sentence_index(self.sentences)
+        return find_word_sentences(self.text, words, sentences=self.sentences, sentence_index=self._sentence_index)
+
+def analyze_text(
+    text: str,
+    language: str,
+    profile: str = "lemmas",
+    chunk_size: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1
+) -> AnalyzedText:
+    """
+    Run the spaCy pipeline over the text once and keep a compact per-token analysis.
+    
+    Texts longer than the model's max_length (or any text when chunk_size is given)
+    are split at paragraph/sentence boundaries and processed with nlp.pipe. Chunk
+    offsets are shifted back to positions in the full text and chunks are kept in
+    document order, so the result matches the single-call path.
+    
+    Args:
+        text: The text to process
+        language: The language of the text
+        profile: Name of the EXTRACTION_PROFILES entry to load the model with
+        chunk_size: Maximum characters per chunk; enables chunked processing when set
+        batch_size: Number of chunks per nlp.pipe batch in chunked mode
+        n_process: Number of worker processes for nlp.pipe in chunked mode
+        
+    Returns:
+        AnalyzedText for the text
+    """
+    nlp = load_language_model(language, profile=profile)
+    
+    if chunk_size is None and len(text) <= nlp.max_length:
+        chunks = [text]
+    else:
+        chunks = split_text_into_chunks(text, min(chunk_size or DEFAULT_CHUNK_CHARS, nlp.max_length))
+    
+    return _analyze_chunks(nlp, chunks, language, profile, batch_size, n_process)
+
+def analyze_pages(
+    pages: Iterable[str],
+    language: str,
+    profile: str = "lemmas",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1
+) -> AnalyzedText:
+    """
+    Analyze a document page by page as the pages arrive (e.g. from pdf_processor.iter_pdf_pages).
+    
+    Pages are joined with a single space, as in pdf_processor.extract_text_from_pdf,
+    and only a batch of pages is held by the pipeline at a time.
+    
+    Args:
+        pages: Iterable of page texts in document order
+        language: The language of the text
+        profile: Name of the EXTRACTION_PROFILES entry to load the model with
+        batch_size: Number of pages per nlp.pipe batch
+        n_process: Number of worker processes for nlp.pipe
+        
+    Returns:
+        AnalyzedText for the joined pages
+    """
+    nlp = load_language_model(language, profile=profile)
+    
+    def page_chunks() -> Iterator[str]:
+        previous_page = None
+        for page in pages:
+            if not page:
+                continue
+            if previous_page is not None:
+                yield from split_text_into_chunks(previous_page + " ", nlp.max_length)
+            previous_page = page
+        if previous_page is not None:
+            yield from split_text_into_chunks(previous_page, nlp.max_length)
+    
+    return _analyze_chunks(nlp, page_chunks(), language, profile, batch_size, n_process)
+
+def _analyze_chunks(
+    nlp,
+    chunks: Iterable[str],
+    language: str,
+    profile: str,
+    batch_size: int,
+    n_process: int
+) -> AnalyzedText:
+    """
+    Run the pipeline over consecutive chunks of a text and merge their token arrays.
+    
+    Args:
+        nlp: Loaded spaCy language model
+        chunks: Consecutive chunks of the text, in document order
+        language: The language of the text
+        profile: Name of the EXTRACTION_PROFILES entry the model was loaded with
+        batch_size: Number of chunks per nlp.pipe batch
+        n_process: Number of worker processes for nlp.pipe
+        
+    Returns:
+        AnalyzedText for the concatenated chunks
+    """
+    arrays = []
+    texts = []
+    offset = 0
+    for doc in nlp.pipe(chunks, batch_size=batch_size, n_process=n_process):
+        array = doc.to_array(ANALYSIS_ATTRS)
+        # Token offsets are relative to the chunk; make them relative to the full text
+        array[:, ANALYSIS_ATTRS.index(IDX)] += offset
+        arrays.append(array)
+        texts.append(doc.text)
+        offset += len(doc.text)
+    
+    if arrays:
+        token_array = numpy.concatenate(arrays)
+    else:
+        token_array = numpy.zeros((0, len(ANALYSIS_ATTRS)), dtype=numpy.uint64)
+    
+    return AnalyzedText("".join(texts), language, token_array, nlp.vocab.strings, profile)
+
+def _get_model_version(language: str) -> str:
+    """
+    Get the installed version of a language's spaCy model without loading it.
+    
+    Args:
+        language: The language name
+        
+    Returns:
+        Model name and version, e.g. "es_core_news_sm==3.8.0"
+    """
+    model_name = LANGUAGE_TO_MODEL.get(language, "en_core_web_sm")
+    try:
+        version = spacy.util.get_package_version(model_name)
+    except Exception:
+        version = None
+    return f"{model_name}=={version or 'unknown'}"
+
+def get_text_digest(text: str) -> str:
+    """
+    Compute the digest identifying a text in the categorize_words cache.
+    
+    Equal to the hex SHA-256 of the UTF-8 encoded text, so callers streaming a
+    text (e.g. page by page) can compute it incrementally with hashlib.
+    
+    Args:
+        text: The text
+        
+    Returns:
+        Hex digest of the text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _default_word_types(include_proper_nouns: bool) -> Dict[str, bool]:
+    """Word types categorize_words includes when none are given."""
+    return {
+        "nouns": True,
+        "verbs": True,
+        "adjectives": True,
+        "adverbs": True,
+        "proper_nouns": include_proper_nouns,
+        "numbers": False,
+        "other": False
+    }
+
+def _categorize_cache_key(
+    text_digest: str,
+    language: str,
+    min_length: int,
+    word_types: Dict[str, bool],
+    include_proper_nouns: bool
+) -> str:
+    """
+    Build the cache key for a categorize_words call.
+    
+    Args:
+        text_digest: Digest of the text to process, from get_text_digest
+        language: The language of the text
+        min_length: Minimum word length to include
+        word_types: Dictionary mapping word types to boolean values indicating inclusion
+        include_proper_nouns: Whether to include proper nouns
+        
+    Returns:
+        Hex digest identifying the text and options
+    """
+    options = json.dumps({
+        "text": text_digest,
+        "language": language,
+        "model": _get_model_version(language),
+        "min_length": min_length,
+        "word_types": word_types,
+        "include_proper_nouns": include_proper_nouns,
+        "version": CATEGORIZE_CACHE_VERSION
+    }, sort_keys=True)
+    return hashlib.sha256(options.encode("utf-8")).hexdigest()
+
+def _copy_categories(categories: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Copy a categories dictionary so callers can't modify cached results."""
+    return {category: list(words) for category, words in categories.items()}
+
+def _get_cached_categories(key: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Look up a categorize_words result in memory, then on disk.
+    
+    Args:
+        key: Cache key from _categorize_cache_key
+        
+    Returns:
+        Copy of the cached result, or None if it is not cached
+    """
+    with _categorize_cache_lock:
+        if key in _categorize_cache:
+            _categorize_cache.move_to_end(key)
+            _categorize_cache_stats["memory_hits"] += 1
+            return _copy_categories(_categorize_cache[key])
+    
+    try:
+        cache_path = os.path.join(CATEGORIZE_CACHE_DIR, f"{key}.json")
+        with open(cache_path, "r", encoding="utf-8") as f:
+            categories = json.load(f)
+        os.utime(cache_path)  # Refresh the mtime used for LRU eviction
+    except Exception:
+        with _categorize_cache_lock:
+            _categorize_cache_stats["misses"] += 1
+        return None
+    
+    with _categorize_cache_lock:
+        _categorize_cache_stats["disk_hits"] += 1
+    _remember_categories(key, categories)
+    return _copy_categories(categories)
+
+def _remember_categories(key: str, categories: Dict[str, List[str]]) -> None:
+    """Add a result to the in-memory cache, evicting the least recently used one if full."""
+    with _categorize_cache_lock:
+        _categorize_cache[key] = _copy_categories(categories)
+        _categorize_cache.move_to_end(key)
+        while len(_categorize_cache) > CATEGORIZE_CACHE_SIZE:
+            _categorize_cache.popitem(last=False)
+
+def _store_categories(key: str, categories: Dict[str, List[str]]) -> None:
+    """
+    Store a categorize_words result in memory and on disk, evicting old disk
+    entries beyond CATEGORIZE_CACHE_MAX_BYTES.
+    
+    Args:
+        key: Cache key from _categorize_cache_key
+        categories: Dictionary mapping categories to lists of words
+    """
+    _remember_categories(key, categories)
+    try:
+        os.makedirs(CATEGORIZE_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=CATEGORIZE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(categories, f, ensure_ascii=False)
+        os.replace(temp_path, os.path.join(CATEGORIZE_CACHE_DIR, f"{key}.json"))
+        
+        _evict_categorize_cache_entries()
+    except Exception as e:
+        print(f"Warning: Could not write categorize cache: {str(e)}")
+
+def _evict_categorize_cache_entries() -> None:
+    """Delete the least recently used disk entries until the cache fits in CATEGORIZE_CACHE_MAX_BYTES."""
+    entries = []
+    for filename in os.listdir(CATEGORIZE_CACHE_DIR):
+        if filename.endswith(".json"):
+            path = os.path.join(CATEGORIZE_CACHE_DIR, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= CATEGORIZE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+        with _categorize_cache_lock:
+            _categorize_cache_stats["evictions"] += 1
+
+def get_categorize_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss counters of the categorize_words result cache.
+    
+    Returns:
+        Dictionary of counters
+    """
+    with _categorize_cache_lock:
+        return dict(_categorize_cache_stats)
+
+def get_cached_categories(
+    text_digest: str,
+    language: str,
+    min_length: int = 3,
+    include_proper_nouns: bool = False,
+    word_types: Optional[Dict[str, bool]] = None
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Look up a cached categorize_words result without analyzing the text.
+    
+    Lets callers that stream a text skip the analysis when it was already categorized.
+    
+    Args:
+        text_digest: Digest of the text, from get_text_digest
+        language: The language of the text
+        min_length: Minimum word length to include
+        include_proper_nouns: Whether to include proper nouns
+        word_types: Dictionary mapping word types to boolean values indicating inclusion
+        
+    Returns:
+        Dictionary mapping categories to lists of words, or None if not cached
+    """
+    if word_types is None:
+        word_types = _default_word_types(include_proper_nouns)
+    return _get_cached_categories(
+        _categorize_cache_key(text_digest, language, min_length, word_types, include_proper_nouns)
+    )
+
 def categorize_words(
     text: str, 
     language: str, 
     min_length: int = 3, 
     include_proper_nouns: bool = False,
     word_types: Optional[Dict[str, bool]] = None,
-    existing_words: Optional[Set[str]] = None
+    existing_words: Optional[Set[str]] = None,
+    chunk_size: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1,
+    analysis: Optional[AnalyzedText] = None,
+    use_cache: bool = True,
+    text_digest: Optional[str] = None
 ) -> Dict[str, List[str]]:
     """
     Categorize words in the text by their part of speech using spaCy.
     
+    Texts longer than the model's max_length (or any text when chunk_size is given)
+    are processed in chunks, see analyze_text. Results are cached in memory and on
+    disk by text digest, language, model version and extraction options.
+    
     Args:
         text: The text to process
         language: The language of the text
@@ -210,29 +828,37 @@ def categorize_words(
         include_proper_nouns: Whether to include proper nouns
         word_types: Dictionary mapping word types to boolean values indicating inclusion
         existing_words: Set of existing words to check against (for de-duplication)
+        chunk_size: Maximum characters per chunk; enables chunked processing when set
+        batch_size: Number of chunks per nlp.pipe batch in chunked mode
+        n_process: Number of worker processes for nlp.pipe in chunked mode
+        analysis: Optional existing analysis of the text to reuse instead of reparsing
+        use_cache: Whether to read from and write to the result cache
+        text_digest: Digest of the text from get_text_digest, if already known
         
     Returns:
         Dictionary mapping categories to lists of words
     """
     # Initialize default values for optional parameters
     if word_types is None:
-        word_types = {
-            "nouns": True,
-            "verbs": True,
-            "adjectives": True,
-            "adverbs": True,
-            "proper_nouns": include_proper_nouns,
-            "numbers": False,
-            "other": False
-        }
+        word_types = _default_word_types(include_proper_nouns)
     
     if existing_words is None:
         existing_words = set()
-    # Load language model
-    nlp = load_language_model(language)
     
-    # Process the text
-    doc = nlp(text)
+    # Return the cached result if this text was already categorized with the same options
+    cache_key = None
+    if use_cache:
+        if text_digest is None:
+            text_digest = get_text_digest(analysis.text if analysis is not None else text)
+        cache_key = _categorize_cache_key(text_digest, language, min_length, word_types, include_proper_nouns)
+        cached_categories = _get_cached_categories(cache_key)
+        if cached_categories is not None:
+            return cached_categories
+    
+    # Process the text, with a model lacking the components categorizing doesn't use
+    if analysis is None:
+        analysis = analyze_text(text, language, profile="categorize", chunk_size=chunk_size,
+                                batch_size=batch_size, n_process=n_process)
     
     # Initialize categories
     categories = defaultdict(set)
@@ -269,7 +895,7 @@ def categorize_words(
         existing_words_set.update([w.lower() for w in existing_words])
     
     # Process words
-    for token in doc:
+    for token in analysis.tokens():
         # Skip punctuation and stop words
         if token.is_punct or token.is_stop or token.is_space:
             continue
@@ -279,14 +905,14 @@ def categorize_words(
             continue
         
         # Normalize word (lowercase unless it's a proper noun)
-        word = token.text if token.pos_ == "PROPN" else token.text.lower()
+        word = token.text if token.pos == "PROPN" else token.text.lower()
         
         # Skip proper nouns if not included
-        if token.pos_ == "PROPN" and not include_proper_nouns:
+        if token.pos == "PROPN" and not include_proper_nouns:
             continue
         
         # Skip words with POS tags not in the allowed set
-        if token.pos_ not in allowed_pos:
+        if token.pos not in allowed_pos:
             continue
         
         # Skip if this word (or variant) already exists in the already_processed set (deduplication within text)
@@ -297,7 +923,7 @@ def categorize_words(
         already_processed.add(word.lower())
         
         # Add word to its category
-        category = POS_TO_CATEGORY.get(token.pos_, "Other")
+        category = POS_TO_CATEGORY.get(token.pos, "Other")
         categories[category].add(word)
     
     # Normalize adjectives (combine gender forms)
@@ -309,28 +935,56 @@ def categorize_words(
         else:
             result_dict[category] = sorted(list(words))
     
+    if cache_key is not None:
+        _store_categories(cache_key, result_dict)
+    
     return result_dict
 
-def extract_lemmas(text: str, language: str) -> List[str]:
+def _lemmatized_analysis(text: str, language: str, analysis: Optional[AnalyzedText]) -> AnalyzedText:
+    """
+    Get an analysis with lemmas, reusing the given one when it has them.
+    
+    Args:
+        text: The text to process
+        language: The language of the text
+        analysis: Optional existing analysis of the text
+        
+    Returns:
+        AnalyzedText made with the lemmatizer
+    """
+    if analysis is not None and analysis.has_lemmas:
+        return analysis
+    if analysis is not None:
+        print(f"DEBUG: Analysis made with the '{analysis.profile}' profile has no lemmas, reanalyzing")
+        text = analysis.text
+    return analyze_text(text, language, profile="lemmas")
+
+def extract_lemmas(text: str, language: str, analysis: Optional[AnalyzedText] = None) -> List[str]:
     """
     Extract lemmas (dictionary forms) of words in the text.
     
     Args:
         text: The text to process
         language: The language of the text
+        analysis: Optional existing analysis of the text to reuse instead of reparsing;
+                  one made without the lemmatizer is replaced by a "lemmas" analysis
         
     Returns:
         List of lemmas
     """
-    nlp = load_language_model(language)
-    doc = nlp(text)
+    analysis = _lemmatized_analysis(text, language, analysis)
     
     # Extract lemmas, filtering out stop words and punctuation
-    lemmas = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
+    lemmas = [token.lemma for token in analysis.tokens() if not token.is_stop and not token.is_punct]
     
     return lemmas
 
-def get_important_words(text: str, language: str, top_n: int = 100) -> List[str]:
+def get_important_words(
+    text: str,
+    language: str,
+    top_n: int = 100,
+    analysis: Optional[AnalyzedText] = None
+) -> List[str]:
     """
     Extract the most important words from the text using frequency.
     
@@ -338,18 +992,19 @@ def get_important_words(text: str, language: str, top_n: int = 100) -> List[str]
         text: The text to process
         language: The language of the text
         top_n: Number of top words to return
+        analysis: Optional existing analysis of the text to reuse instead of reparsing;
+                  one made without the lemmatizer is replaced by a "lemmas" analysis
         
     Returns:
         List of the most important words
     """
-    nlp = load_language_model(language)
-    doc = nlp(text)
+    analysis = _lemmatized_analysis(text, language, analysis)
     
     # Count word frequencies (excluding stop words and punctuation)
     word_freq = defaultdict(int)
-    for token in doc:
+    for token in analysis.tokens():
         if not token.is_stop and not token.is_punct and len(token.text) > 2:
-            word_freq[token.lemma_] += 1
+            word_freq[token.lemma] += 1
     
     # Sort words by frequency
     top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
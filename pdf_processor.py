@@ -1,46 +1,426 @@
 import io
 import os
 import re
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+import multiprocessing
+import threading
 import PyPDF2
-from typing import List, Dict, Any, Optional, Tuple, Set
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Set
 
-def extract_text_from_pdf(pdf_path: str, page_range: Optional[Tuple[int, int]] = None) -> str:
+# Number of worker processes used for page extraction (1 extracts in-process)
+PDF_EXTRACTION_WORKERS = max(1, int(os.environ.get("PDF_EXTRACTION_WORKERS", os.cpu_count() or 1)))
+
+# Below this many pages per worker, starting processes costs more than it saves
+MIN_PAGES_PER_WORKER = 8
+
+# Each worker gets several smaller page spans so uneven pages balance out
+SPANS_PER_WORKER = 4
+
+# Number of spans per worker extracted ahead of the consumer when streaming pages
+SPANS_IN_FLIGHT_PER_WORKER = 2
+
+# Directory for the on-disk cache of extracted page text
+PDF_CACHE_DIR = "pdf_cache"
+
+# Maximum total size of the extraction cache before the least recently used entries are evicted
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+# Version of clean_text; bump it whenever the cleaning rules change so stale cache entries are ignored
+CLEANER_VERSION = 1
+
+# Word tokens used by the sentence index (Unicode-aware, matching \b word boundaries)
+WORD_TOKEN_PATTERN = re.compile(r'\w+')
+
+_pdf_cache_lock = threading.Lock()
+_pdf_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def _resolve_page_range(num_pages: int, page_range: Optional[Tuple[int, int]]) -> Tuple[int, int]:
     """
-    Extract text from a PDF file with optional page range specification.
+    Convert a user-facing page range into 0-indexed [start, end) bounds.
+    
+    Args:
+        num_pages: Number of pages in the PDF
+        page_range: Tuple of (start_page, end_page) (1-indexed as shown to user), or None for all pages
+        
+    Returns:
+        Tuple of (start_index, end_index)
+    """
+    if page_range:
+        start_page = max(0, page_range[0] - 1)  # Convert from 1-indexed to 0-indexed
+        end_page = min(num_pages, page_range[1])  # Convert from 1-indexed to 0-indexed
+    else:
+        start_page = 0
+        end_page = num_pages
+    return start_page, end_page
+
+def _iter_page_span(reader: PyPDF2.PdfReader, start_page: int, end_page: int) -> Iterator[Dict[str, Any]]:
+    """
+    Extract the raw text of a contiguous span of pages one page at a time.
+    
+    Args:
+        reader: Open PDF reader
+        start_page: First page to extract (0-indexed, inclusive)
+        end_page: Last page to extract (0-indexed, exclusive)
+        
+    Returns:
+        Iterator of page dictionaries with 'page' (1-indexed), 'text' and 'seconds'
+    """
+    for page_num in range(start_page, end_page):
+        start_time = time.perf_counter()
+        page_text = reader.pages[page_num].extract_text() or ""
+        yield {
+            "page": page_num + 1,
+            "text": page_text,
+            "seconds": time.perf_counter() - start_time
+        }
+
+def _extract_page_span(pdf_path: str, start_page: int, end_page: int) -> List[Dict[str, Any]]:
+    """
+    Extract the raw text of a contiguous span of pages with a reader of its own.
+    Runs in worker processes, so it must stay a module-level function.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: First page to extract (0-indexed, inclusive)
+        end_page: Last page to extract (0-indexed, exclusive)
+        
+    Returns:
+        List of page dictionaries with 'page' (1-indexed), 'text' and 'seconds'
+    """
+    with open(pdf_path, "rb") as file:
+        return list(_iter_page_span(PyPDF2.PdfReader(file), start_page, end_page))
+
+def _iter_raw_pages(
+    pdf_path: str,
+    page_range: Optional[Tuple[int, int]] = None,
+    workers: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract the raw text of each page as it becomes available, in page order.
+    
+    With several workers, at most SPANS_IN_FLIGHT_PER_WORKER spans per worker are
+    extracted ahead of the consumer, so memory stays bounded by that window.
     
     Args:
         pdf_path: Path to the PDF file
         page_range: Tuple of (start_page, end_page) to extract (1-indexed as shown to user)
                     If None, extracts all pages
+        workers: Number of worker processes (default: PDF_EXTRACTION_WORKERS)
         
     Returns:
-        Extracted text as a string
+        Iterator of page dictionaries with 'page' (1-indexed), 'text' and 'seconds'
+    """
+    if workers is None:
+        workers = PDF_EXTRACTION_WORKERS
+    
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        start_page, end_page = _resolve_page_range(len(reader.pages), page_range)
+        page_count = max(0, end_page - start_page)
+        
+        # Don't start more workers than there are pages to keep them busy
+        workers = max(1, min(workers, page_count // MIN_PAGES_PER_WORKER))
+        if workers == 1:
+            yield from _iter_page_span(reader, start_page, end_page)
+            return
+    
+    # Split the range into contiguous spans, submitted in page order
+    span_count = workers * SPANS_PER_WORKER
+    span_size = -(-page_count // span_count)  # Ceiling division
+    spans = ((span_start, min(end_page, span_start + span_size))
+             for span_start in range(start_page, end_page, span_size))
+    
+    # Spawn fresh workers: forking a process that runs Streamlit's threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending = deque(
+            executor.submit(_extract_page_span, pdf_path, span_start, span_end)
+            for span_start, span_end in islice(spans, workers * SPANS_IN_FLIGHT_PER_WORKER)
+        )
+        while pending:
+            span_pages = pending.popleft().result()
+            # Keep the window full before handing the finished span to the consumer
+            for span_start, span_end in islice(spans, 1):
+                pending.append(executor.submit(_extract_page_span, pdf_path, span_start, span_end))
+            yield from span_pages
+
+def get_file_digest(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _pdf_cache_path(pdf_path: str, page_range: Optional[Tuple[int, int]]) -> str:
+    """
+    Get the cache file path for a PDF's extracted pages.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_range: Requested page range, or None for all pages
+        
+    Returns:
+        Path of the cache entry (which may not exist yet)
+    """
+    range_key = f"{page_range[0]}-{page_range[1]}" if page_range else "all"
+    key = f"{get_file_digest(pdf_path)}:{range_key}:{CLEANER_VERSION}"
+    return os.path.join(PDF_CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json.z")
+
+def _read_pdf_cache(cache_path: str) -> Optional[List[Dict[str, Any]]]:
     """
-    text = ""
+    Load cached pages, marking the entry as recently used.
     
+    Args:
+        cache_path: Path of the cache entry
+        
+    Returns:
+        List of page dictionaries, or None if the entry is missing or unreadable
+    """
     try:
-        with open(pdf_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            num_pages = len(reader.pages)
-            
-            # Determine page range
-            if page_range:
-                start_page = max(0, page_range[0] - 1)  # Convert from 1-indexed to 0-indexed
-                end_page = min(num_pages, page_range[1])  # Convert from 1-indexed to 0-indexed
-            else:
-                start_page = 0
-                end_page = num_pages
+        with open(cache_path, "rb") as f:
+            pages = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        os.utime(cache_path)  # Refresh the mtime used for LRU eviction
+    except Exception:
+        with _pdf_cache_lock:
+            _pdf_cache_stats["misses"] += 1
+        return None
+    
+    with _pdf_cache_lock:
+        _pdf_cache_stats["hits"] += 1
+    return [{"page": page, "text": text, "seconds": 0.0, "cached": True} for page, text in pages]
+
+class _PdfCacheWriter:
+    """
+    Stream extracted pages into a new cache entry as they arrive.
+    
+    Pages are compressed into a temporary file in PDF_CACHE_DIR, which replaces the
+    entry only once every page has been written, so concurrent readers never see a
+    partial entry and no page list is held in memory.
+    """
+    
+    def __init__(self, cache_path: str):
+        """
+        Args:
+            cache_path: Path of the cache entry
+        """
+        self.cache_path = cache_path
+        self._compressor = zlib.compressobj()
+        self._file = None
+        self._temp_path = None
+        self._separator = b"["
+        try:
+            os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+            fd, self._temp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".tmp")
+            self._file = os.fdopen(fd, "wb")
+        except Exception as e:
+            print(f"Warning: Could not write PDF extraction cache: {str(e)}")
+            self.abort()
+    
+    def add(self, page: Dict[str, Any]) -> None:
+        """
+        Append one page to the entry.
+        
+        Args:
+            page: Page dictionary with cleaned 'text'
+        """
+        if self._file is None:
+            return
+        try:
+            data = self._separator + json.dumps([page["page"], page["text"]]).encode("utf-8")
+            self._file.write(self._compressor.compress(data))
+            self._separator = b", "
+        except Exception as e:
+            print(f"Warning: Could not write PDF extraction cache: {str(e)}")
+            self.abort()
+    
+    def commit(self) -> None:
+        """Publish the entry and evict old entries beyond PDF_CACHE_MAX_BYTES."""
+        if self._file is None:
+            return
+        try:
+            closing = b"[]" if self._separator == b"[" else b"]"
+            self._file.write(self._compressor.compress(closing))
+            self._file.write(self._compressor.flush())
+            self._file.close()
+            self._file = None
+            os.replace(self._temp_path, self.cache_path)
+            self._temp_path = None
             
-            # Extract text from each page in the range
-            for page_num in range(start_page, end_page):
-                page = reader.pages[page_num]
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            _evict_pdf_cache_entries()
+        except Exception as e:
+            print(f"Warning: Could not write PDF extraction cache: {str(e)}")
+            self.abort()
+    
+    def abort(self) -> None:
+        """Discard the partial entry."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
+
+def _evict_pdf_cache_entries() -> None:
+    """Delete the least recently used cache entries until the cache fits in PDF_CACHE_MAX_BYTES."""
+    entries = []
+    for filename in os.listdir(PDF_CACHE_DIR):
+        if filename.endswith(".json.z"):
+            path = os.path.join(PDF_CACHE_DIR, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+        with _pdf_cache_lock:
+            _pdf_cache_stats["evictions"] += 1
+
+def get_pdf_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss/eviction counters of the extraction cache.
+    
+    Returns:
+        Dictionary of counters
+    """
+    with _pdf_cache_lock:
+        return dict(_pdf_cache_stats)
+
+def _iter_cleaned_pages(
+    pdf_path: str,
+    page_range: Optional[Tuple[int, int]] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield cleaned pages, from the extraction cache when possible.
+    
+    A freshly extracted PDF is streamed into the cache as its pages are consumed and
+    published once the last page has been yielded.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_range: Tuple of (start_page, end_page) to extract (1-indexed as shown to user)
+                    If None, extracts all pages
+        workers: Number of worker processes (default: PDF_EXTRACTION_WORKERS)
+        use_cache: Whether to read from and write to the extraction cache
+        
+    Returns:
+        Iterator of page dictionaries with 'page' (1-indexed), cleaned 'text' and 'seconds'
+    """
+    cache_path = _pdf_cache_path(pdf_path, page_range) if use_cache else None
+    if cache_path:
+        cached_pages = _read_pdf_cache(cache_path)
+        if cached_pages is not None:
+            print(f"DEBUG: Loaded {len(cached_pages)} pages from the extraction cache")
+            yield from cached_pages
+            return
+    
+    cache_writer = _PdfCacheWriter(cache_path) if cache_path else None
+    page_count = 0
+    extraction_seconds = 0.0
+    slowest_page = None
+    try:
+        for page in _iter_raw_pages(pdf_path, page_range, workers):
+            page = dict(page, text=clean_text(page["text"]))
+            page_count += 1
+            extraction_seconds += page["seconds"]
+            if slowest_page is None or page["seconds"] > slowest_page["seconds"]:
+                slowest_page = page
+            if cache_writer:
+                cache_writer.add(page)
+            yield page
+        
+        if slowest_page is not None:
+            print(f"DEBUG: Extracted {page_count} pages in {extraction_seconds:.2f}s of page time "
+                  f"(slowest: page {slowest_page['page']}, {slowest_page['seconds']:.2f}s)")
+        if cache_writer:
+            cache_writer.commit()
+    finally:
+        # Drop the partial entry if extraction failed or the consumer stopped early
+        if cache_writer:
+            cache_writer.abort()
+
+def iter_pdf_pages(
+    pdf_path: str,
+    page_range: Optional[Tuple[int, int]] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the cleaned text of each page as soon as it has been extracted.
+    
+    Lets later stages (NLP, progress reporting) consume a book page by page instead
+    of waiting for, and holding, the whole text.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_range: Tuple of (start_page, end_page) to extract (1-indexed as shown to user)
+                    If None, extracts all pages
+        workers: Number of worker processes (default: PDF_EXTRACTION_WORKERS)
+        use_cache: Whether to read from and write to the extraction cache
+        
+    Returns:
+        Iterator of (page_number, cleaned_text) tuples in page order (page numbers are 1-indexed)
+    """
+    try:
+        for page in _iter_cleaned_pages(pdf_path, page_range, workers, use_cache):
+            yield page["page"], page["text"]
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+def extract_text_from_pdf(
+    pdf_path: str,
+    page_range: Optional[Tuple[int, int]] = None,
+    workers: Optional[int] = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Extract text from a PDF file with optional page range specification.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_range: Tuple of (start_page, end_page) to extract (1-indexed as shown to user)
+                    If None, extracts all pages
+        workers: Number of worker processes (default: PDF_EXTRACTION_WORKERS)
+        use_cache: Whether to read from and write to the extraction cache
         
-        # Clean the text
-        text = clean_text(text)
-        return text
+    Returns:
+        Extracted text as a string
+    """
+    try:
+        # Pages are cleaned one at a time and joined once, rather than concatenated
+        page_texts = [
+            page["text"] for page in _iter_cleaned_pages(pdf_path, page_range, workers, use_cache)
+            if page["text"]
+        ]
+        return " ".join(page_texts)
     
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
@@ -118,36 +498,81 @@ def extract_sentences(text: str) -> List[str]:
     return sentences
 
 
-def find_word_sentences(text: str, words: List[str]) -> Dict[str, List[str]]:
+def build_sentence_index(sentences: List[str]) -> Dict[str, List[int]]:
+    """
+    Build an inverted index from each case-folded word token to the sentences containing it.
+    
+    Args:
+        sentences: List of sentences, e.g. from extract_sentences
+        
+    Returns:
+        Dictionary mapping each token to the ascending ids (list positions) of its sentences
+    """
+    index = defaultdict(list)
+    for sentence_id, sentence in enumerate(sentences):
+        # dict.fromkeys drops repeated tokens while keeping this a single pass
+        for token in dict.fromkeys(WORD_TOKEN_PATTERN.findall(sentence.casefold())):
+            index[token].append(sentence_id)
+    return dict(index)
+
+def find_word_sentences(
+    text: str,
+    words: List[str],
+    sentences: Optional[List[str]] = None,
+    sentence_index: Optional[Dict[str, List[int]]] = None
+) -> Dict[str, List[str]]:
     """
     Find sentences in the text that contain each word.
     
+    Sentences are looked up through an inverted token index, so each single-token
+    word is a dictionary hit instead of a regex scan over every sentence. Words made
+    of several tokens (or with non-word characters) only scan the sentences that
+    contain all of their tokens.
+    
     Args:
         text: The text to search in
         words: List of words to find sentences for
+        sentences: Optional sentences already split from the text by extract_sentences
+        sentence_index: Optional index of the sentences from build_sentence_index
         
     Returns:
         Dictionary mapping each word to a list of sentences that contain it
     """
     # Extract all sentences from the text
-    sentences = extract_sentences(text)
+    if sentences is None:
+        sentences = extract_sentences(text)
+    if sentence_index is None:
+        sentence_index = build_sentence_index(sentences)
     
     # Initialize result dictionary
     word_sentences = {word: [] for word in words}
     
     # For each word, find sentences that contain it
     for word in words:
-        # Create a pattern that matches the word as a whole word (not part of another word)
-        pattern = r'\b' + re.escape(word) + r'\b'
+        folded_word = word.casefold()
+        tokens = WORD_TOKEN_PATTERN.findall(folded_word)
         
-        # Case-insensitive search
-        regex = re.compile(pattern, re.IGNORECASE)
+        if len(tokens) == 1 and tokens[0] == folded_word:
+            # Plain single-token word: the index entry is exactly the set of matching sentences
+            # Limit to 5 sentences per word to avoid excessive data
+            word_sentences[word] = [sentences[i] for i in sentence_index.get(folded_word, [])[:5]]
+            continue
         
-        # Find sentences that contain the word
-        for sentence in sentences:
-            if regex.search(sentence):
+        # Only sentences containing every token of the word can match
+        if tokens:
+            postings = sorted((sentence_index.get(token, []) for token in set(tokens)), key=len)
+            other_postings = [set(posting) for posting in postings[1:]]
+            candidate_ids = [i for i in postings[0] if all(i in posting for posting in other_postings)]
+        else:
+            candidate_ids = range(len(sentences))
+        
+        # Create a pattern that matches the word as a whole word (not part of another word)
+        regex = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+        for i in candidate_ids:
+            if regex.search(sentences[i]):
+                word_sentences[word].append(sentences[i])
                 # Limit to 5 sentences per word to avoid excessive data
-                if len(word_sentences[word]) < 5:
-                    word_sentences[word].append(sentence)
+                if len(word_sentences[word]) == 5:
+                    break
     
     return word_sentences
@@ -0,0 +1,229 @@
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Default (requests per second, burst size) per provider; override the rate with
+# RATE_LIMIT_<PROVIDER> environment variables, e.g. RATE_LIMIT_GCLOUD_TTS=15
+PROVIDER_RATES = {
+    "sonnet": (10.0, 10),
+    # Google Cloud TTS default quota is 1,000 requests per minute
+    "gcloud_tts": (15.0, 15),
+    # gTTS uses the unofficial Google Translate endpoint; stay well below its limits
+    "gtts": (5.0, 5)
+}
+
+# Rate and burst for providers missing from PROVIDER_RATES
+DEFAULT_RATE = (5.0, 5)
+
+# Retries after a throttled (429) response before giving up
+MAX_RETRIES = 5
+
+# Exponential backoff: BACKOFF_BASE * 2^attempt seconds, capped at BACKOFF_MAX, with full jitter
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# Throttling cuts the rate by this factor; each success adds back this fraction of the quota
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_FRACTION = 0.05
+
+# The adaptive rate never drops below this fraction of the quota
+MIN_RATE_FRACTION = 0.05
+
+_limiters: Dict[str, "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+class RateLimited(Exception):
+    """Raised by a rate-limited call when the provider throttled the request."""
+
+    def __init__(self, retry_after: Optional[float] = None, message: str = "Rate limited by provider"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (seconds or an HTTP date).
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """
+    Adaptive token bucket for one provider.
+
+    Calls take a token before running, so requests go out as fast as the quota
+    allows and no faster. A throttled response halves the rate and pauses the
+    bucket for the provider's Retry-After; successes raise the rate back
+    towards the quota.
+    """
+
+    def __init__(self, provider: str, rate: float, burst: int):
+        """
+        Args:
+            provider: Provider name, used in messages
+            rate: Quota in requests per second
+            burst: Maximum number of requests sent back to back
+        """
+        self.provider = provider
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "throttled": 0, "retries": 0, "wait_seconds": 0.0}
+
+    def _refill(self, now: float) -> None:
+        # Caller holds self._lock
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                self._stats["wait_seconds"] += wait
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Raise the rate back towards the quota after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_INCREASE_FRACTION)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slow down after a throttled request.
+
+        Args:
+            retry_after: Seconds the provider asked us to wait, if it said
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate * RATE_DECREASE_FACTOR)
+            self._tokens = 0.0
+            self._stats["throttled"] += 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def call(self, func: Callable[..., Any], *args, max_retries: int = MAX_RETRIES, **kwargs) -> Any:
+        """
+        Run a request under the rate limit, retrying it while the provider throttles.
+
+        func signals throttling by raising RateLimited; other exceptions propagate.
+
+        Args:
+            func: Function sending the request
+            *args: Positional arguments for func
+            max_retries: Retries after throttled attempts
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            RateLimited: If the request is still throttled after max_retries retries
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            with self._lock:
+                self._stats["calls"] += 1
+            try:
+                result = func(*args, **kwargs)
+            except RateLimited as e:
+                self.on_throttle(e.retry_after)
+                if attempt >= max_retries:
+                    print(f"Warning: {self.provider} still rate limited after {max_retries} retries")
+                    raise
+                # Exponential backoff with full jitter, never shorter than Retry-After
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                delay = max(delay, e.retry_after or 0.0)
+                print(f"DEBUG: {self.provider} rate limited, retrying in {delay:.1f}s")
+                with self._lock:
+                    self._stats["retries"] += 1
+                    self._stats["wait_seconds"] += delay
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.on_success()
+            return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the limiter's counters and current rate.
+
+        Returns:
+            Dictionary with calls, throttled, retries, wait_seconds and rate
+        """
+        with self._lock:
+            return dict(self._stats, rate=self.rate)
+
+def get_provider_rate(provider: str) -> Tuple[float, int]:
+    """
+    Get the configured (requests per second, burst) of a provider.
+
+    Args:
+        provider: Provider name
+
+    Returns:
+        Tuple of (rate, burst)
+    """
+    rate, burst = PROVIDER_RATES.get(provider, DEFAULT_RATE)
+    override = os.environ.get(f"RATE_LIMIT_{provider.upper()}")
+    if override:
+        rate = float(override)
+        burst = max(1, int(rate))
+    return rate, burst
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get the process-wide rate limiter of a provider, creating it on first use.
+
+    Args:
+        provider: Provider name (see PROVIDER_RATES)
+
+    Returns:
+        Shared RateLimiter
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            rate, burst = get_provider_rate(provider)
+            _limiters[provider] = RateLimiter(provider, rate, burst)
+        return _limiters[provider]
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Get the counters of every rate limiter created so far.
+
+    Returns:
+        Dictionary mapping provider names to their stats
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items()}
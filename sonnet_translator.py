@@ -1,37 +1,315 @@
-
 import os
+import threading
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Tuple
+from translation_memory import TranslationMemory, get_translation_memory
+from rate_limiter import RateLimited, get_rate_limiter, parse_retry_after
+
+# Base URL of the Sonnet API; point it at a stand-in server for offline benchmarks
+SONNET_API_URL = os.environ.get("SONNET_API_URL", "https://api.sonnet.sh/v1")
+
+# Number of keep-alive connections kept open per host
+TRANSLATOR_POOL_SIZE = int(os.environ.get("SONNET_POOL_SIZE", "10"))
+
+# (connect, read) timeouts in seconds for each request
+TRANSLATOR_TIMEOUT = (
+    float(os.environ.get("SONNET_CONNECT_TIMEOUT", "5")),
+    float(os.environ.get("SONNET_READ_TIMEOUT", "30"))
+)
+
+# Maximum number of texts sent in one batch request
+MAX_BATCH_SIZE = 100
+
+# Number of batch (or single-text fallback) requests in flight at once
+TRANSLATOR_WORKERS = int(os.environ.get("SONNET_WORKERS", "4"))
+
+# Provider name under which translations are kept in the translation memory
+PROVIDER_NAME = "sonnet"
+
+_default_translator = None
+_default_translator_lock = threading.Lock()
+
+class SonnetTranslator:
+    """
+    Client for the Sonnet translation API.
+
+    Requests go through one pooled requests.Session, so consecutive calls reuse
+    keep-alive connections instead of paying a new TCP/TLS handshake each time.
+    With a translation memory, only texts it has not seen before reach the API.
+    Requests share the "sonnet" rate limiter, which backs off on 429 responses.
+    The client is thread-safe.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool_size: int = TRANSLATOR_POOL_SIZE,
+        timeout: Tuple[float, float] = TRANSLATOR_TIMEOUT,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        memory: Optional[TranslationMemory] = None
+    ):
+        """
+        Args:
+            api_key: Sonnet API key (defaults to the SONNET_API_KEY environment variable)
+            base_url: API base URL (defaults to SONNET_API_URL)
+            pool_size: Number of keep-alive connections kept open
+            timeout: (connect, read) timeouts in seconds
+            max_batch_size: Maximum number of texts per batch request
+            memory: Translation memory consulted before and filled after API calls (None to disable)
+        """
+        self.api_key = api_key if api_key is not None else os.environ.get("SONNET_API_KEY")
+        self.base_url = (base_url or SONNET_API_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.memory = memory
+        self.rate_limiter = get_rate_limiter(PROVIDER_NAME)
+        # Cleared the first time the server shows it has no batch endpoint
+        self.batch_supported = True
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.api_key:
+            self.session.headers["Authorization"] = f"Bearer {self.api_key}"
+
+    def translate(self, text: str, source_lang: str = "es", target_lang: str = "en") -> Optional[str]:
+        """
+        Translate a single text.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Translated text or None if translation fails
+        """
+        if self.memory is not None:
+            translation = self.memory.get(text, source_lang, target_lang, PROVIDER_NAME)
+            if translation is not None:
+                return translation
+
+        if not self.api_key:
+            print("Warning: SONNET_API_KEY not found in environment variables")
+            return None
+
+        translation = self._post_text(text, source_lang, target_lang)
+        if self.memory is not None:
+            self.memory.put(text, source_lang, target_lang, PROVIDER_NAME, translation)
+        return translation
+
+    def _post_text(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """
+        Send one single-text request.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Translated text or None if the request failed
+        """
+        def send() -> Optional[str]:
+            response = self._post(
+                f"{self.base_url}/translate",
+                {
+                    "text": text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang
+                }
+            )
+            response.raise_for_status()
+            return response.json()["translation"]
+
+        try:
+            return self.rate_limiter.call(send)
+        except Exception as e:
+            print(f"Translation error: {str(e)}")
+            return None
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str = "es",
+        target_lang: str = "en",
+        workers: int = 1
+    ) -> Dict[str, Optional[str]]:
+        """
+        Translate many texts, sending up to max_batch_size texts per request.
+
+        Falls back to one request per text when the server has no batch endpoint
+        or a batch request fails.
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            workers: Number of batches translated concurrently
+
+        Returns:
+            Dictionary mapping each text to its translation (None if it failed)
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        translations = {}
+        if self.memory is not None:
+            translations.update(self.memory.get_many(unique_texts, source_lang, target_lang, PROVIDER_NAME))
+            unique_texts = [text for text in unique_texts if text not in translations]
+        if not unique_texts:
+            return translations
+
+        if not self.api_key:
+            print("Warning: SONNET_API_KEY not found in environment variables")
+            translations.update((text, None) for text in unique_texts)
+            return translations
+
+        batches = [
+            unique_texts[start:start + self.max_batch_size]
+            for start in range(0, len(unique_texts), self.max_batch_size)
+        ]
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+                for batch_translations in executor.map(
+                    lambda batch: self._translate_chunk(batch, source_lang, target_lang), batches
+                ):
+                    translations.update(batch_translations)
+        else:
+            for batch in batches:
+                translations.update(self._translate_chunk(batch, source_lang, target_lang))
+        return translations
+
+    def _translate_chunk(self, texts: List[str], source_lang: str, target_lang: str) -> Dict[str, Optional[str]]:
+        """
+        Translate one batch of texts through the API and record the results in the memory.
+
+        Args:
+            texts: Texts to translate (at most max_batch_size)
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Dictionary mapping each text to its translation (None if it failed)
+        """
+        batch_translations = self._post_batch(texts, source_lang, target_lang) if self.batch_supported else None
+        if batch_translations is None:
+            batch_translations = [self._post_text(text, source_lang, target_lang) for text in texts]
+        batch_translations = dict(zip(texts, batch_translations))
+        if self.memory is not None:
+            self.memory.put_many(batch_translations, source_lang, target_lang, PROVIDER_NAME)
+        return batch_translations
+
+    def _post_batch(self, texts: List[str], source_lang: str, target_lang: str) -> Optional[List[Optional[str]]]:
+        """
+        Send one batch request.
+
+        Args:
+            texts: Texts to translate (at most max_batch_size)
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Translations in the order of texts, or None if the batch request failed
+        """
+        try:
+            response = self.rate_limiter.call(
+                self._post,
+                f"{self.base_url}/translate/batch",
+                {
+                    "texts": texts,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang
+                }
+            )
+            if response.status_code in (404, 405, 501):
+                print("DEBUG: Translation API has no batch endpoint, translating one text per request")
+                self.batch_supported = False
+                return None
+            response.raise_for_status()
+            translations = response.json()["translations"]
+            if len(translations) != len(texts):
+                raise ValueError(f"expected {len(texts)} translations, got {len(translations)}")
+            return translations
+        except Exception as e:
+            print(f"Batch translation error, translating one text per request: {str(e)}")
+            return None
+
+    def _post(self, url: str, payload: Dict) -> requests.Response:
+        """
+        POST a JSON payload on the pooled session.
+
+        Args:
+            url: Endpoint URL
+            payload: JSON body
+
+        Returns:
+            The response
+
+        Raises:
+            RateLimited: If the API answered 429 Too Many Requests
+        """
+        response = self.session.post(url, json=payload, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RateLimited(parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+def get_default_translator() -> SonnetTranslator:
+    """
+    Get the process-wide translator, recreating it if the API key or URL changed.
+    It uses the shared translation memory.
+
+    A replaced translator is not closed, since other threads may still be sending
+    requests on it; its connections are released when it is garbage-collected.
+
+    Returns:
+        Shared SonnetTranslator
+    """
+    global _default_translator
+    api_key = os.environ.get("SONNET_API_KEY")
+    base_url = os.environ.get("SONNET_API_URL", SONNET_API_URL).rstrip("/")
+    with _default_translator_lock:
+        if (_default_translator is None or _default_translator.api_key != api_key
+                or _default_translator.base_url != base_url):
+            _default_translator = SonnetTranslator(api_key=api_key, base_url=base_url, memory=get_translation_memory())
+        return _default_translator
 
 def translate_text(text: str, source_lang: str = "es", target_lang: str = "en") -> Optional[str]:
     """
     Translate text using Sonnet API.
-    
+
     Args:
         text: Text to translate
         source_lang: Source language code
         target_lang: Target language code
-        
+
     Returns:
         Translated text or None if translation fails
     """
-    api_key = os.environ.get("SONNET_API_KEY")
-    if not api_key:
-        print("Warning: SONNET_API_KEY not found in environment variables")
-        return None
-        
-    try:
-        response = requests.post(
-            "https://api.sonnet.sh/v1/translate",
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "text": text,
-                "source_lang": source_lang,
-                "target_lang": target_lang
-            }
-        )
-        response.raise_for_status()
-        return response.json()["translation"]
-    except Exception as e:
-        print(f"Translation error: {str(e)}")
-        return None
+    return get_default_translator().translate(text, source_lang, target_lang)
+
+def translate_batch(
+    texts: List[str],
+    source_lang: str = "es",
+    target_lang: str = "en",
+    workers: int = TRANSLATOR_WORKERS
+) -> Dict[str, Optional[str]]:
+    """
+    Translate many texts using Sonnet API, batching requests where possible.
+
+    Args:
+        texts: Texts to translate
+        source_lang: Source language code
+        target_lang: Target language code
+        workers: Number of requests in flight at once
+
+    Returns:
+        Dictionary mapping each text to its translation (None if it failed)
+    """
+    return get_default_translator().translate_batch(texts, source_lang, target_lang, workers)
@@ -0,0 +1,211 @@
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# Location of the persistent translation memory
+TRANSLATION_MEMORY_PATH = os.environ.get("TRANSLATION_MEMORY_PATH", os.path.join("translation_cache", "memory.sqlite3"))
+
+# Number of translations kept in the in-process LRU in front of SQLite
+TRANSLATION_MEMORY_LRU_SIZE = int(os.environ.get("TRANSLATION_MEMORY_LRU_SIZE", "50000"))
+
+# Maximum number of texts looked up per SQLite query (bound parameter limit)
+LOOKUP_CHUNK_SIZE = 500
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+_translation_memory = None
+_translation_memory_lock = threading.Lock()
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize source text for translation memory keys: NFC, lowercase, single spaces.
+
+    Args:
+        text: Source text
+
+    Returns:
+        Normalized text
+    """
+    return WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFC', text)).strip().lower()
+
+class TranslationMemory:
+    """
+    Persistent store of translations keyed by (normalized text, source language,
+    target language, provider), with an in-process LRU in front of SQLite.
+    The store is thread-safe.
+    """
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH, lru_size: int = TRANSLATION_MEMORY_LRU_SIZE):
+        """
+        Args:
+            path: Path of the SQLite database
+            lru_size: Number of translations kept in memory
+        """
+        self.path = path
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                text TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                PRIMARY KEY (source_lang, target_lang, provider, text)
+            )
+        """)
+        self._conn.commit()
+
+    def _remember(self, key: Tuple[str, str, str, str], translation: str) -> None:
+        # Caller holds self._lock
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_lang: str,
+        target_lang: str,
+        provider: str
+    ) -> Dict[str, str]:
+        """
+        Look up translations for many texts at once.
+
+        Args:
+            texts: Source texts
+            source_lang: Source language code
+            target_lang: Target language code
+            provider: Translation provider name
+
+        Returns:
+            Dictionary mapping each text that has a stored translation to it
+        """
+        found = {}
+        missing: Dict[str, list] = {}
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                normalized = normalize_text(text)
+                key = (normalized, source_lang, target_lang, provider)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[text] = self._lru[key]
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.setdefault(normalized, []).append(text)
+
+            normalized_texts = list(missing)
+            for start in range(0, len(normalized_texts), LOOKUP_CHUNK_SIZE):
+                chunk = normalized_texts[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT text, translation FROM translations "
+                    f"WHERE source_lang = ? AND target_lang = ? AND provider = ? "
+                    f"AND text IN ({', '.join('?' for _ in chunk)})",
+                    [source_lang, target_lang, provider, *chunk]
+                )
+                for normalized, translation in rows:
+                    self._remember((normalized, source_lang, target_lang, provider), translation)
+                    for text in missing.pop(normalized):
+                        found[text] = translation
+                        self._stats["disk_hits"] += 1
+
+            self._stats["misses"] += sum(len(texts) for texts in missing.values())
+        return found
+
+    def get(self, text: str, source_lang: str, target_lang: str, provider: str) -> Optional[str]:
+        """
+        Look up the translation of a text.
+
+        Args:
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            provider: Translation provider name
+
+        Returns:
+            Stored translation or None
+        """
+        return self.get_many([text], source_lang, target_lang, provider).get(text)
+
+    def put_many(self, translations: Dict[str, str], source_lang: str, target_lang: str, provider: str) -> None:
+        """
+        Store translations; failed (None or empty) translations are skipped.
+
+        Args:
+            translations: Dictionary mapping source texts to their translations
+            source_lang: Source language code
+            target_lang: Target language code
+            provider: Translation provider name
+        """
+        rows = [
+            (normalize_text(text), source_lang, target_lang, provider, translation)
+            for text, translation in translations.items() if translation
+        ]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations (text, source_lang, target_lang, provider, translation) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            for normalized, source, target, name, translation in rows:
+                self._remember((normalized, source, target, name), translation)
+            self._stats["stores"] += len(rows)
+
+    def put(self, text: str, source_lang: str, target_lang: str, provider: str, translation: Optional[str]) -> None:
+        """
+        Store a translation; a failed (None or empty) translation is skipped.
+
+        Args:
+            text: Source text
+            source_lang: Source language code
+            target_lang: Target language code
+            provider: Translation provider name
+            translation: Translated text
+        """
+        self.put_many({text: translation}, source_lang, target_lang, provider)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters and the hit rate of this memory.
+
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses, stores, hit_rate and the number of entries in memory
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["lru_entries"] = len(self._lru)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+def get_translation_memory() -> TranslationMemory:
+    """
+    Get the process-wide translation memory, opening it on first use.
+
+    Returns:
+        Shared TranslationMemory
+    """
+    global _translation_memory
+    with _translation_memory_lock:
+        if _translation_memory is None:
+            _translation_memory = TranslationMemory()
+        return _translation_memory